@@ -74,6 +74,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "cv.middleware.PerfilActivoMiddleware",  # ✅ request.perfil sin consulta por petición
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -180,4 +181,75 @@ cloudinary.config(
     api_key=os.getenv("CLOUDINARY_API_KEY"),
     api_secret=os.getenv("CLOUDINARY_API_SECRET"),
     secure=True
-)
\ No newline at end of file
+)
+# ==========================================================
+# ✅ CACHE (en disco, compartida por los workers de gunicorn)
+# ==========================================================
+CACHE_DIR = Path(os.environ.get("CACHE_DIR", BASE_DIR / ".cache"))
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_DIR / "django",
+    }
+}
+
+# ✅ PDFs generados (LRU por tamaño)
+CV_PDF_CACHE_DIR = CACHE_DIR / "pdf"
+CV_PDF_CACHE_MAX_BYTES = int(os.environ.get("CV_PDF_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+
+# ✅ Motor del PDF: "reportlab" o "weasyprint" (se puede pedir con ?engine=)
+CV_PDF_ENGINE = os.environ.get("CV_PDF_ENGINE", "reportlab")
+
+# ✅ PDFs linealizados ("fast web view"); requiere el binario qpdf
+CV_PDF_LINEARIZE = os.environ.get("CV_PDF_LINEARIZE", "0") == "1"
+CV_PDF_STREAM_CHUNK_BYTES = 64 * 1024
+
+# ✅ Trabajos de PDF "procesando" por más de esto vuelven a la cola
+CV_PDF_JOB_TIMEOUT = int(os.environ.get("CV_PDF_JOB_TIMEOUT", 600))
+# ✅ Trabajos terminados (listos o con error) se borran después de estos días
+CV_PDF_JOB_RETENCION_DIAS = int(os.environ.get("CV_PDF_JOB_RETENCION_DIAS", 7))
+
+# ✅ Descargas simultáneas de imágenes al generar el PDF
+CV_MEDIA_FETCH_WORKERS = int(os.environ.get("CV_MEDIA_FETCH_WORKERS", 8))
+
+# ✅ Copia local de fotos/certificados de Cloudinary (LRU por tamaño)
+CV_MEDIA_CACHE_DIR = CACHE_DIR / "media"
+CV_MEDIA_CACHE_MAX_BYTES = int(os.environ.get("CV_MEDIA_CACHE_MAX_BYTES", 500 * 1024 * 1024))
+CV_MEDIA_CACHE_TTL = int(os.environ.get("CV_MEDIA_CACHE_TTL", 24 * 60 * 60))
+
+# ✅ Imágenes reducidas para el PDF (resolución de impresión + calidad JPEG)
+CV_IMAGE_CACHE_DIR = CACHE_DIR / "imagenes"
+CV_IMAGE_CACHE_MAX_BYTES = int(os.environ.get("CV_IMAGE_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+CV_PDF_IMAGE_DPI = int(os.environ.get("CV_PDF_IMAGE_DPI", 150))
+CV_PDF_IMAGE_QUALITY = int(os.environ.get("CV_PDF_IMAGE_QUALITY", 80))
+
+# ✅ HTML de la página principal cacheado por versión de datos (segundos)
+CV_PAGE_CACHE_TIMEOUT = int(os.environ.get("CV_PAGE_CACHE_TIMEOUT", 24 * 60 * 60))
+
+# ✅ Productos por página en /garage/ (paginación por cursor)
+CV_GARAGE_PAGE_SIZE = int(os.environ.get("CV_GARAGE_PAGE_SIZE", 24))
+
+# ✅ Máximo de filas por página en la API JSON (?limit=)
+CV_API_MAX_LIMIT = int(os.environ.get("CV_API_MAX_LIMIT", 100))
+
+# ✅ Miniaturas web: anchos (px) del srcset y calidad de WebP/AVIF/JPEG
+CV_IMAGE_WIDTHS = (160, 320, 480, 640, 960, 1280)
+CV_IMAGE_WEB_QUALITY = int(os.environ.get("CV_IMAGE_WEB_QUALITY", 75))
+
+# ✅ Carga masiva de certificados en el admin (subidas en paralelo)
+CV_UPLOAD_WORKERS = int(os.environ.get("CV_UPLOAD_WORKERS", 8))
+CV_CERTIFICADO_MAX_BYTES = int(os.environ.get("CV_CERTIFICADO_MAX_BYTES", 10 * 1024 * 1024))
+
+# ✅ Fotos subidas: se normalizan (lado mayor, calidad JPEG) y se suben dentro del request.
+# ✅ CV_UPLOADS_DIFERIDOS=1 las deja en cola (SubidaPendiente) y REQUIERE un proceso
+# ✅ aparte corriendo siempre, p. ej. un worker de Render / línea de Procfile:
+# ✅     worker: python manage.py upload_worker
+# ✅ sin ese proceso las fotos nunca llegan a Cloudinary.
+CV_FOTO_MAX_PX = int(os.environ.get("CV_FOTO_MAX_PX", 1600))
+CV_FOTO_QUALITY = int(os.environ.get("CV_FOTO_QUALITY", 85))
+CV_UPLOADS_DIFERIDOS = os.environ.get("CV_UPLOADS_DIFERIDOS", "0") == "1"
+CV_UPLOAD_MAX_INTENTOS = int(os.environ.get("CV_UPLOAD_MAX_INTENTOS", 3))
+# ✅ Espera antes de reintentar una subida fallida (se duplica en cada fallo)
+CV_UPLOAD_BACKOFF = int(os.environ.get("CV_UPLOAD_BACKOFF", 30))
+CV_UPLOAD_TIMEOUT = int(os.environ.get("CV_UPLOAD_TIMEOUT", 300))
@@ -0,0 +1,31 @@
+import copy
+import threading
+
+from .models import DatosPersonales
+from .versioning import active_profile_version
+
+
+# ======================================================
+# ✅ PERFIL ACTIVO CACHEADO EN EL PROCESO
+# ✅ Cada worker guarda la fila y solo vuelve a consultarla cuando
+# ✅ cambia la versión compartida (se sube al escribir DatosPersonales).
+# ======================================================
+_lock = threading.Lock()
+_cache = {"version": None, "perfil": None}
+
+
+def perfil_activo():
+    """✅ Copia del perfil activo (o None); sin consulta si nada cambió."""
+    version = active_profile_version()
+
+    with _lock:
+        if _cache["version"] != version:
+            # ✅ la versión se lee ANTES de consultar: si alguien escribe en
+            # ✅ medio, la próxima petición verá otra versión y recargará
+            _cache["perfil"] = DatosPersonales.objects.filter(perfilactivo=1).order_by("pk").first()
+            _cache["version"] = version
+        perfil = _cache["perfil"]
+
+    # ✅ cada petición recibe su copia (los formularios modifican la instancia)
+    return copy.copy(perfil) if perfil is not None else None
+
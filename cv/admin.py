@@ -1,19 +1,339 @@
-from django.contrib import admin
-from .models import VentaGarage
+from decimal import Decimal
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Round
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+
+from . import certificados, signals, snapshots, uploads
+from .search import buscar_garage
 from .models import (
     DatosPersonales, ExperienciaLaboral, Reconocimientos, CursosRealizados,
-    ProductosAcademicos, ProductosLaborales, VentaGarage
+    ProductosAcademicos, ProductosLaborales, VentaGarage, TrabajoPDF, PerfilSnapshot,
+    SubidaPendiente,
 )
 
-admin.site.register(DatosPersonales)
-admin.site.register(ExperienciaLaboral)
-admin.site.register(Reconocimientos)
-admin.site.register(CursosRealizados)
-admin.site.register(ProductosAcademicos)
-admin.site.register(ProductosLaborales)
+
+# ======================================================
+# ✅ ACCIONES MASIVAS: UN SOLO UPDATE ... WHERE id IN (...)
+# ✅ update() no dispara señales: cachés, versiones y snapshots a mano
+# ======================================================
+def actualizar_en_bloque(modeladmin, request, queryset, **valores):
+    perfil_ids = set(queryset.values_list("perfil_id", flat=True).distinct())
+    with transaction.atomic():
+        n = queryset.update(**valores)
+        signals.cambio_masivo({queryset.model}, perfil_ids)
+    modeladmin.message_user(request, f"✅ {n} fila(s) actualizada(s).", messages.SUCCESS)
+
+
+# ======================================================
+# ✅ FILTRO POR PERFIL CON UN CAMPO DE TEXTO
+# ✅ list_filter = ("perfil",) listaría TODOS los perfiles en cada página
+# ======================================================
+class PerfilFiltro(admin.ListFilter):
+    title = "perfil"
+    parameter_name = "perfil"
+    template = "admin/cv/filtro_perfil.html"
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        valor = params.pop(self.parameter_name, None)
+        if isinstance(valor, list):
+            valor = valor[-1] if valor else None
+        self.valor = valor.strip() if valor and valor.strip().isdigit() else None
+        if self.valor:
+            self.used_parameters[self.parameter_name] = self.valor
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.parameter_name]
+
+    def queryset(self, request, queryset):
+        if self.valor:
+            return queryset.filter(perfil_id=int(self.valor))
+        return queryset
+
+    def choices(self, changelist):
+        # ✅ el resto de filtros viaja en campos ocultos (sin la página actual)
+        ocultos = [
+            (k, v) for k, valores in self.request.GET.lists()
+            if k not in (self.parameter_name, "p") for v in valores
+        ]
+        yield {
+            "valor": self.valor or "",
+            "ocultos": ocultos,
+            "limpiar": changelist.get_query_string(remove=[self.parameter_name]),
+        }
+
+
+class SeccionAdmin(admin.ModelAdmin):
+    """✅ Base de las secciones del CV: perfil sin N+1 y sin cargar todos en el <select>."""
+    list_select_related = ("perfil",)
+    autocomplete_fields = ("perfil",)
+    # ✅ índice <seccion>_perfil_visible
+    list_filter = (PerfilFiltro, "activarparaqueseveaenfront")
+    # ✅ sin COUNT(*) de toda la tabla en cada página
+    show_full_result_count = False
+    actions = ("mostrar", "ocultar")
+
+    @admin.action(description="Mostrar en la página")
+    def mostrar(self, request, queryset):
+        actualizar_en_bloque(self, request, queryset, activarparaqueseveaenfront=True)
+
+    @admin.action(description="Ocultar de la página")
+    def ocultar(self, request, queryset):
+        actualizar_en_bloque(self, request, queryset, activarparaqueseveaenfront=False)
+
+
+# ======================================================
+# ✅ CARGA MASIVA DE CERTIFICADOS (ver cv/certificados.py)
+# ======================================================
+class MultipleFileInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
+
+
+class MultipleFileField(forms.FileField):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("widget", MultipleFileInput())
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        limpiar = super().clean
+        if isinstance(data, (list, tuple)):
+            return [limpiar(d, initial) for d in data]
+        return [limpiar(data, initial)]
+
+
+class CertificadosForm(forms.Form):
+    archivos = MultipleFileField(
+        label="Archivos",
+        help_text="El nombre indica el registro: su id (12.pdf, CUR-12.pdf) o su título.",
+    )
+    mapeo = forms.CharField(
+        required=False, widget=forms.Textarea(attrs={"rows": 4, "cols": 60}),
+        label="Mapeo (opcional)", help_text='Una línea por archivo: "archivo.pdf = 12".',
+    )
+
+
+class CertificadosMasivosMixin:
+    """✅ /admin/cv/<modelo>/certificados/: muchos archivos, una petición."""
+    change_list_template = "admin/cv/change_list_certificados.html"
+    certificado_prefijo = ""
+    certificado_titulo = ""
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path("certificados/", self.admin_site.admin_view(self.certificados_view),
+                 name="%s_%s_certificados" % info),
+        ] + super().get_urls()
+
+    def certificados_view(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        form = CertificadosForm(request.POST or None, request.FILES or None)
+        errores = []
+        if request.method == "POST" and form.is_valid():
+            pares, errores = certificados.emparejar(
+                form.cleaned_data["archivos"], self.get_queryset(request),
+                self.certificado_prefijo, self.certificado_titulo,
+                certificados.leer_mapeo(form.cleaned_data["mapeo"]),
+            )
+            subidos, fallidos = certificados.subir(pares)
+            errores += fallidos
+            if subidos:
+                n = certificados.guardar(self.model, subidos)
+                self.message_user(request, f"✅ {n} certificado(s) asignado(s).", messages.SUCCESS)
+            if not errores:
+                return redirect(f"admin:{self.opts.app_label}_{self.opts.model_name}_changelist")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.opts,
+            "title": f"Subir certificados: {self.opts.verbose_name_plural}",
+            "form": form,
+            "errores": errores,
+            "prefijo": self.certificado_prefijo,
+        }
+        return TemplateResponse(request, "admin/cv/certificados_masivos.html", context)
+
+
+# ======================================================
+# ✅ FOTOS: SE GUARDA YA, SE SUBEN EN SEGUNDO PLANO (ver cv/uploads.py)
+# ======================================================
+class FotosDiferidasMixin:
+    campos_foto = ()
+
+    def save_model(self, request, obj, form, change):
+        uploads.guardar_diferido(obj, self.campos_foto)
+
+
+# ======================================================
+# ✅ PERFIL
+# ======================================================
+@admin.register(DatosPersonales)
+class DatosPersonalesAdmin(FotosDiferidasMixin, admin.ModelAdmin):
+    campos_foto = ("fotoperfil",)
+    list_display = ("nombres", "apellidos", "numerocedula", "perfilactivo")
+    # ✅ índice perfil_activo_idperfil
+    list_filter = ("perfilactivo",)
+    # ✅ lo usa el autocompletado de "perfil" en las demás pantallas
+    search_fields = ("=numerocedula", "apellidos", "nombres")
+    # ✅ orden estable para paginar el autocompletado
+    ordering = ("idperfil",)
+
+
+# ======================================================
+# ✅ SECCIONES DEL CV
+# ======================================================
+@admin.register(ExperienciaLaboral)
+class ExperienciaLaboralAdmin(SeccionAdmin):
+    list_display = ("cargodesempenado", "nombrempresa", "fechainiciogestion", "perfil", "activarparaqueseveaenfront")
+    search_fields = ("cargodesempenado", "nombrempresa")
+
+
+@admin.register(CursosRealizados)
+class CursosRealizadosAdmin(CertificadosMasivosMixin, SeccionAdmin):
+    certificado_prefijo = "CUR"
+    certificado_titulo = "nombrecurso"
+    list_display = ("nombrecurso", "entidadpatrocinadora", "fechainicio", "totalhoras", "perfil", "activarparaqueseveaenfront")
+    search_fields = ("nombrecurso", "entidadpatrocinadora")
+
+
+@admin.register(Reconocimientos)
+class ReconocimientosAdmin(CertificadosMasivosMixin, SeccionAdmin):
+    certificado_prefijo = "REC"
+    certificado_titulo = "descripcionreconocimiento"
+    list_display = ("descripcionreconocimiento", "tiporeconocimiento", "fechareconocimiento", "perfil", "activarparaqueseveaenfront")
+    list_filter = SeccionAdmin.list_filter + ("tiporeconocimiento",)
+    search_fields = ("descripcionreconocimiento", "entidadpatrocinadora")
+
+
+@admin.register(ProductosAcademicos)
+class ProductosAcademicosAdmin(CertificadosMasivosMixin, SeccionAdmin):
+    certificado_prefijo = "PA"
+    certificado_titulo = "nombrerecurso"
+    list_display = ("nombrerecurso", "clasificador", "perfil", "activarparaqueseveaenfront")
+    search_fields = ("nombrerecurso", "clasificador")
+
+
+@admin.register(ProductosLaborales)
+class ProductosLaboralesAdmin(CertificadosMasivosMixin, SeccionAdmin):
+    certificado_prefijo = "PL"
+    certificado_titulo = "nombreproducto"
+    list_display = ("nombreproducto", "fechaproducto", "perfil", "activarparaqueseveaenfront")
+    search_fields = ("nombreproducto",)
+
+
+# ======================================================
+# ✅ GARAGE
+# ======================================================
+class AjustePrecioForm(ActionForm):
+    # ✅ aparece junto al selector de acciones
+    porcentaje = forms.DecimalField(
+        required=False, max_digits=5, decimal_places=2,
+        min_value=Decimal("-99.99"), max_value=Decimal("1000"),
+        label="Ajuste de precio (%)",
+    )
+
 
 @admin.register(VentaGarage)
-class VentaGarageAdmin(admin.ModelAdmin):
-    list_display = ("nombreproducto", "valordelbien", "estadoproducto", "condicion", "activarparaqueseveaenfront")
-    list_filter = ("estadoproducto", "condicion", "activarparaqueseveaenfront")
-    search_fields = ("nombreproducto",)
\ No newline at end of file
+class VentaGarageAdmin(FotosDiferidasMixin, SeccionAdmin):
+    campos_foto = ("fotoproducto",)
+    list_display = ("nombreproducto", "valordelbien", "estadoproducto", "condicion", "perfil", "activarparaqueseveaenfront")
+    # ✅ índices garage_estado_orden / garage_condicion_orden
+    list_filter = (PerfilFiltro, "estadoproducto", "condicion", "activarparaqueseveaenfront")
+    search_fields = ("nombreproducto", "descripcion")
+    action_form = AjustePrecioForm
+    actions = SeccionAdmin.actions + ("marcar_vendido", "marcar_disponible", "ajustar_precio")
+
+    def get_search_results(self, request, queryset, search_term):
+        # ✅ índice de texto completo en vez de LIKE '%...%' (ver cv/search.py)
+        return buscar_garage(queryset, search_term), False
+
+    @admin.action(description="Marcar como Vendido")
+    def marcar_vendido(self, request, queryset):
+        actualizar_en_bloque(self, request, queryset, estadoproducto="Vendido")
+
+    @admin.action(description="Marcar como Disponible")
+    def marcar_disponible(self, request, queryset):
+        actualizar_en_bloque(self, request, queryset, estadoproducto="Disponible")
+
+    @admin.action(description="Ajustar precio (porcentaje indicado)")
+    def ajustar_precio(self, request, queryset):
+        form = self.action_form(request.POST)
+        form.fields["action"].choices = self.get_action_choices(request)
+        if not form.is_valid() or form.cleaned_data["porcentaje"] in (None, 0):
+            self.message_user(request, "Indica un porcentaje válido (-99.99 a 1000).", messages.ERROR)
+            return
+
+        factor = 1 + form.cleaned_data["porcentaje"] / 100
+        # ✅ max_digits=10, decimal_places=2: el resultado debe caber
+        tope = Decimal("99999999.99") / factor
+        if queryset.filter(valordelbien__gt=tope).exists():
+            self.message_user(request, "Algún precio excedería el máximo permitido.", messages.ERROR)
+            return
+        actualizar_en_bloque(self, request, queryset, valordelbien=Round(F("valordelbien") * factor, 2))
+
+
+# ======================================================
+# ✅ INTERNOS: COLA DE PDF Y SNAPSHOTS (SOLO CONSULTA)
+# ======================================================
+@admin.register(TrabajoPDF)
+class TrabajoPDFAdmin(admin.ModelAdmin):
+    list_display = ("token", "perfil", "motor", "estado", "progreso", "creado")
+    list_select_related = ("perfil",)
+    autocomplete_fields = ("perfil",)
+    # ✅ índice trabajopdf_estado_creado
+    list_filter = ("estado", "motor")
+    readonly_fields = ("token", "clave", "error", "creado", "actualizado")
+    show_full_result_count = False
+
+
+@admin.register(PerfilSnapshot)
+class PerfilSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("perfil", "actualizado")
+    list_select_related = ("perfil",)
+    readonly_fields = ("perfil", "documento", "actualizado")
+    actions = ("reconstruir",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Reconstruir snapshot")
+    def reconstruir(self, request, queryset):
+        ids = list(queryset.values_list("pk", flat=True))
+        for perfil_id in ids:
+            snapshots.reconstruir(perfil_id)
+        self.message_user(request, f"✅ {len(ids)} snapshot(s) reconstruido(s).", messages.SUCCESS)
+
+
+@admin.register(SubidaPendiente)
+class SubidaPendienteAdmin(admin.ModelAdmin):
+    list_display = ("modelo", "objeto_id", "campo", "nombre", "estado", "intentos", "proximo_intento", "creado")
+    # ✅ índice subida_estado_creado
+    list_filter = ("estado",)
+    exclude = ("contenido",)
+    readonly_fields = ("token", "modelo", "objeto_id", "campo", "nombre", "intentos", "proximo_intento", "error", "creado", "actualizado")
+    actions = ("reintentar",)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Reintentar subida")
+    def reintentar(self, request, queryset):
+        n = queryset.update(estado="pendiente", intentos=0, error="", proximo_intento=timezone.now())
+        self.message_user(request, f"✅ {n} subida(s) de vuelta en la cola.", messages.SUCCESS)
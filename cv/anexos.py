@@ -0,0 +1,74 @@
+from collections import defaultdict
+
+from .models import (
+    CursosRealizados, Reconocimientos, ProductosAcademicos, ProductosLaborales
+)
+
+
+# ======================================================
+# ✅ TIPOS DE ANEXO: PREFIJO -> (MODELO, NOMBRE A MOSTRAR)
+# ======================================================
+TIPOS_ANEXO = {
+    "CUR": (CursosRealizados, lambda o: o.nombrecurso),
+    "REC": (Reconocimientos, lambda o: f"{o.tiporeconocimiento} - {o.descripcionreconocimiento}"),
+    "PA": (ProductosAcademicos, lambda o: f"{o.nombrerecurso} - {o.clasificador}"),
+    "PL": (ProductosLaborales, lambda o: o.nombreproducto),
+}
+
+
+def parse_tokens(tokens):
+    """
+    ✅ "CUR-3" -> ("CUR", 3). Descarta los inválidos y los repetidos,
+    ✅ conservando el orden en que llegaron.
+    """
+    vistos = set()
+    pares = []
+    for token in tokens:
+        token = str(token).strip()
+        if "-" not in token:
+            continue
+        tipo, idx = token.split("-", 1)
+        if tipo not in TIPOS_ANEXO:
+            continue
+        try:
+            idx = int(idx)
+        except ValueError:
+            continue
+        if (tipo, idx) in vistos:
+            continue
+        vistos.add((tipo, idx))
+        pares.append((tipo, idx))
+    return pares
+
+
+def resolver_anexos(perfil, tokens):
+    """
+    ✅ Una consulta por tipo (máx. 4), sin importar cuántos tokens lleguen.
+    ✅ Solo devuelve registros del perfil y con certificado, en el orden pedido.
+    """
+    if not perfil:
+        return []
+
+    pares = parse_tokens(tokens)
+
+    ids_por_tipo = defaultdict(list)
+    for tipo, idx in pares:
+        ids_por_tipo[tipo].append(idx)
+
+    objetos = {}
+    for tipo, ids in ids_por_tipo.items():
+        modelo = TIPOS_ANEXO[tipo][0]
+        objetos[tipo] = modelo.objects.filter(perfil=perfil).in_bulk(ids)
+
+    anexos = []
+    for tipo, idx in pares:
+        obj = objetos[tipo].get(idx)
+        if not obj or not getattr(obj, "rutacertificado", None):
+            continue
+        anexos.append({
+            "token": f"{tipo}-{idx}",
+            "nombre": TIPOS_ANEXO[tipo][1](obj),
+            "archivo": obj.rutacertificado,
+            "url": obj.rutacertificado.url,
+        })
+    return anexos
@@ -0,0 +1,222 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_GET
+
+from .loaders import CAMPOS, visibles
+from .pagination import codificar_cursor, tramos_keyset
+from .search import filtrar_garage
+from .versioning import data_version, site_version
+
+
+# ======================================================
+# ✅ API JSON DE SOLO LECTURA
+# ✅ /api/perfil/                -> datos personales
+# ✅ /api/perfil/<seccion>/      -> colección paginada (cursor ?after=<pk>)
+# ✅ /api/garage/                -> catálogo paginado (cursor ?cursor=, filtros de /garage/)
+# ✅ ?fields=a,b  -> solo esos campos        ?limit=N -> tamaño de página
+# ======================================================
+CAMPOS_PERFIL = (
+    "nombres", "apellidos", "descripcionperfil", "numerocedula", "nacionalidad",
+    "lugarnacimiento", "fechanacimiento", "sexo", "estadocivil", "licenciaconducir",
+    "telefonoconvencional", "telefonofijo", "direcciondomiciliaria", "direcciontrabajo",
+    "sitioweb", "fotoperfil",
+)
+
+# ✅ nombre en la URL -> atributo de cv/loaders.py
+SECCIONES_API = {
+    "experiencia": "experiencia",
+    "cursos": "cursos",
+    "reconocimientos": "reconocimientos_cv",
+    "productos_academicos": "productos_academicos",
+    "productos_laborales": "productos_laborales",
+}
+
+
+def _error(mensaje, status):
+    return JsonResponse({"error": mensaje}, status=status, json_dumps_params={"ensure_ascii": False})
+
+
+def _campos_pedidos(request, permitidos):
+    """✅ ?fields= filtrado a lo permitido; sin ?fields= van todos."""
+    pedidos = [c for c in request.GET.get("fields", "").split(",") if c]
+    if not pedidos:
+        return list(permitidos)
+    return [c for c in pedidos if c in permitidos]
+
+
+def _limite(request):
+    maximo = getattr(settings, "CV_API_MAX_LIMIT", 100)
+    try:
+        return max(1, min(int(request.GET.get("limit", 20)), maximo))
+    except ValueError:
+        return 20
+
+
+def _etag(version, request):
+    # ✅ fuerte: mismo dato + misma URL = mismos bytes
+    base = f"{version}|{request.path}|{sorted(request.GET.lists())}"
+    return '"' + hashlib.sha256(base.encode()).hexdigest()[:32] + '"'
+
+
+def _condicional(request, version):
+    """✅ (etag, respuesta 304 o None) sin tocar la base de datos."""
+    etag = _etag(version, request)
+    no_modificada = get_conditional_response(request, etag=etag)
+    if no_modificada is not None:
+        no_modificada["ETag"] = etag
+    return etag, no_modificada
+
+
+def _serializador(modelo, campos):
+    archivos = {
+        c: modelo._meta.get_field(c).storage
+        for c in campos
+        if isinstance(modelo._meta.get_field(c), models.FileField)
+    }
+
+    def serializar(fila):
+        dato = {"id": fila["pk"]}
+        for c in campos:
+            valor = fila[c]
+            if c in archivos:
+                # ✅ values() trae el nombre; la URL se arma sin red
+                valor = archivos[c].url(valor) if valor else None
+            dato[c] = valor
+        return dato
+
+    return serializar
+
+
+def _json(dato):
+    return json.dumps(dato, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def _stream(tramos, limite, serializar, siguiente_de):
+    """
+    ✅ Escribe {"data": [...], "next": ...} fila por fila desde .iterator().
+    ✅ Se pide una fila de más para saber si hay otra página.
+    """
+    yield '{"data": ['
+    n = 0
+    ultima = None
+    hay_mas = False
+    for tramo in tramos:
+        for fila in tramo[: limite + 1 - n].iterator(chunk_size=limite + 1):
+            if n == limite:
+                hay_mas = True
+                break
+            yield ("," if n else "") + _json(serializar(fila))
+            ultima = fila
+            n += 1
+        if hay_mas:
+            break
+    yield '], "next": ' + _json(siguiente_de(ultima) if hay_mas else None) + "}"
+
+
+def _respuesta_stream(contenido, etag):
+    response = StreamingHttpResponse(contenido, content_type="application/json; charset=utf-8")
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def _siguiente_url(request, parametro, valor):
+    params = request.GET.copy()
+    params[parametro] = valor
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+
+# ======================================================
+# ✅ ENDPOINTS
+# ======================================================
+@require_GET
+def api_perfil(request):
+    perfil = request.perfil
+    if not perfil:
+        return _error("No existe un perfil activo.", 404)
+
+    etag, no_modificada = _condicional(request, f"{perfil.pk}:{data_version(perfil.pk)}")
+    if no_modificada is not None:
+        return no_modificada
+
+    # ✅ request.perfil ya trae la fila: cero consultas
+    dato = {"id": perfil.pk}
+    for c in _campos_pedidos(request, CAMPOS_PERFIL):
+        valor = getattr(perfil, c)
+        if isinstance(valor, FieldFile):
+            valor = valor.url if valor else None
+        dato[c] = valor
+
+    response = JsonResponse({"data": dato}, encoder=DjangoJSONEncoder, json_dumps_params={"ensure_ascii": False})
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@require_GET
+def api_seccion(request, seccion):
+    atributo = SECCIONES_API.get(seccion)
+    if atributo is None:
+        return _error(f"Sección desconocida: {seccion}", 404)
+    perfil = request.perfil
+    if not perfil:
+        return _error("No existe un perfil activo.", 404)
+
+    etag, no_modificada = _condicional(request, f"{perfil.pk}:{data_version(perfil.pk)}")
+    if no_modificada is not None:
+        return no_modificada
+
+    campos = _campos_pedidos(request, CAMPOS["cv"][atributo])
+    qs = visibles("cv", atributo).filter(perfil=perfil).order_by("pk")
+    try:
+        despues = int(request.GET.get("after", 0))
+    except ValueError:
+        return _error("Cursor inválido.", 400)
+    if despues:
+        qs = qs.filter(pk__gt=despues)
+
+    contenido = _stream(
+        [qs.values("pk", *campos)],
+        _limite(request),
+        _serializador(qs.model, campos),
+        lambda ultima: _siguiente_url(request, "after", ultima["pk"]),
+    )
+    return _respuesta_stream(contenido, etag)
+
+
+@require_GET
+def api_garage(request):
+    perfil = request.perfil
+    if not perfil:
+        return _error("No existe un perfil activo.", 404)
+
+    # ✅ VentaGarage sube la versión del sitio (no la del perfil)
+    etag, no_modificada = _condicional(request, f"{perfil.pk}:{site_version()[0]}")
+    if no_modificada is not None:
+        return no_modificada
+
+    campos = _campos_pedidos(request, CAMPOS["garage"]["garage"])
+    qs = filtrar_garage(visibles("garage", "garage").filter(perfil=perfil), request.GET)
+    # ✅ la fecha va siempre: el cursor siguiente sale de la última fila
+    columnas = dict.fromkeys(["pk", "fecha_publicacion", *campos])
+    tramos = [
+        t.values(*columnas)
+        for t in tramos_keyset(qs, "fecha_publicacion", request.GET.get("cursor"))
+    ]
+
+    contenido = _stream(
+        tramos,
+        _limite(request),
+        _serializador(qs.model, campos),
+        lambda ultima: _siguiente_url(
+            request, "cursor", codificar_cursor(ultima["fecha_publicacion"], ultima["pk"])
+        ),
+    )
+    return _respuesta_stream(contenido, etag)
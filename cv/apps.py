@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CvConfig(AppConfig):
     name = 'cv'
+
+    def ready(self):
+        # ✅ registra las señales de invalidación de caché
+        from . import signals  # noqa: F401
+        from .search import revisar_indice_texto
+
+        # ✅ los triggers FTS5 de SQLite no sobreviven a que se rehaga la tabla
+        post_migrate.connect(revisar_indice_texto, sender=self, dispatch_uid="cv_indice_texto")
@@ -0,0 +1,147 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePath
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.text import slugify
+
+from . import media, signals
+
+
+# ======================================================
+# ✅ CARGA MASIVA DE CERTIFICADOS (ADMIN)
+# ✅ 1) cada archivo se empareja con un registro
+# ✅ 2) las subidas al storage van en paralelo (pool acotado)
+# ✅ 3) rutacertificado se actualiza en UNA transacción (bulk_update)
+# ======================================================
+EXTENSIONES = {".pdf", ".png", ".jpg", ".jpeg"}
+
+
+def _max_bytes():
+    return getattr(settings, "CV_CERTIFICADO_MAX_BYTES", 10 * 1024 * 1024)
+
+
+def _workers():
+    return getattr(settings, "CV_UPLOAD_WORKERS", 8)
+
+
+def leer_mapeo(texto):
+    """✅ Líneas "archivo.pdf = 12" -> {"archivo.pdf": "12"}; las que no encajan se ignoran."""
+    mapeo = {}
+    for linea in (texto or "").splitlines():
+        nombre, sep, destino = linea.partition("=")
+        if sep and nombre.strip() and destino.strip():
+            mapeo[nombre.strip()] = destino.strip()
+    return mapeo
+
+
+def _id_de(texto, prefijo):
+    # ✅ "12", "CUR-12" o "CUR_12" (el prefijo es el de los anexos del PDF)
+    m = re.fullmatch(rf"(?:{re.escape(prefijo)}[-_ ]?)?(\d+)", texto.strip(), re.IGNORECASE)
+    return int(m.group(1)) if m else None
+
+
+def emparejar(archivos, qs, prefijo, campo_titulo, mapeo=None):
+    """
+    ✅ Devuelve ([(obj, archivo)], [errores]).
+    ✅ Orden: mapeo explícito -> id en el nombre -> título igual (sin tildes/mayúsculas).
+    ✅ Solo se emparejan registros de `qs` (lo que el usuario puede editar).
+    """
+    mapeo = mapeo or {}
+    errores = []
+    por_id = {}
+    sin_id = []
+
+    for archivo in archivos:
+        extension = PurePath(archivo.name).suffix.lower()
+        if extension not in EXTENSIONES:
+            errores.append(f"{archivo.name}: tipo no permitido ({', '.join(sorted(EXTENSIONES))}).")
+            continue
+        if archivo.size > _max_bytes():
+            errores.append(f"{archivo.name}: supera {_max_bytes() // (1024 * 1024)} MB.")
+            continue
+
+        destino = mapeo.get(archivo.name, PurePath(archivo.name).stem)
+        pk = _id_de(destino, prefijo)
+        if pk is not None:
+            por_id.setdefault(pk, []).append(archivo)
+        else:
+            sin_id.append((slugify(destino), archivo))
+
+    campos = ("pk", "perfil", "rutacertificado", campo_titulo)
+    objs = {obj.pk: obj for obj in qs.filter(pk__in=list(por_id)).only(*campos)}
+
+    if sin_id:
+        # ✅ solo si hace falta: recorre los títulos una vez
+        por_titulo = {}
+        for obj in qs.only(*campos).iterator(chunk_size=500):
+            por_titulo.setdefault(slugify(getattr(obj, campo_titulo)), []).append(obj)
+        for slug, archivo in sin_id:
+            candidatos = por_titulo.get(slug, [])
+            if len(candidatos) == 1:
+                objs[candidatos[0].pk] = candidatos[0]
+                por_id.setdefault(candidatos[0].pk, []).append(archivo)
+            elif candidatos:
+                errores.append(f"{archivo.name}: el título coincide con {len(candidatos)} registros; usa el id.")
+            else:
+                errores.append(f"{archivo.name}: no coincide con ningún registro.")
+
+    pares = []
+    for pk, lista in por_id.items():
+        if pk not in objs:
+            errores.extend(f"{a.name}: no existe el registro {pk}." for a in lista)
+        elif len(lista) > 1:
+            errores.append(f"Registro {pk}: recibió {len(lista)} archivos ({', '.join(a.name for a in lista)}).")
+        else:
+            pares.append((objs[pk], lista[0]))
+    return pares, errores
+
+
+def _subir(obj, archivo):
+    field = obj._meta.get_field("rutacertificado")
+    # ✅ upload_to del campo, igual que un save() normal
+    return field.storage.save(field.generate_filename(obj, archivo.name), archivo, max_length=field.max_length)
+
+
+def subir(pares):
+    """✅ Sube en paralelo -> ([(obj, nombre_en_storage)], [errores])."""
+    if not pares:
+        return [], []
+    subidos, errores = [], []
+    with ThreadPoolExecutor(max_workers=min(_workers(), len(pares))) as pool:
+        futuros = [(obj, archivo, pool.submit(_subir, obj, archivo)) for obj, archivo in pares]
+        for obj, archivo, futuro in futuros:
+            try:
+                subidos.append((obj, futuro.result()))
+            except Exception as e:
+                errores.append(f"{archivo.name}: no se pudo subir ({e}).")
+    return subidos, errores
+
+
+def guardar(modelo, subidos):
+    """✅ Un UPDATE por lote + cachés/snapshots de los perfiles tocados."""
+    anteriores = []
+    for obj, nombre in subidos:
+        if obj.rutacertificado:
+            anteriores.append(obj.rutacertificado)
+        obj.rutacertificado = nombre
+
+    objs = [obj for obj, _ in subidos]
+    try:
+        with transaction.atomic():
+            modelo.objects.bulk_update(objs, ["rutacertificado"])
+            # ✅ bulk_update no dispara señales
+            signals.cambio_masivo({modelo}, {obj.perfil_id for obj in objs})
+    except Exception:
+        # ✅ nada quedó apuntando a lo subido: se borra del storage
+        for obj, nombre in subidos:
+            try:
+                obj._meta.get_field("rutacertificado").storage.delete(nombre)
+            except Exception:
+                pass
+        raise
+
+    for viejo in anteriores:
+        media.invalidar(viejo)
+    return len(objs)
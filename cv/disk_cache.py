@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+
+# ======================================================
+# ✅ UTILIDADES COMUNES DE LAS CACHÉS EN DISCO
+# ======================================================
+def escribir_atomico(ruta, data):
+    """✅ Otro worker nunca ve un archivo a medias."""
+    fd, tmp = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, ruta)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def tocar(ruta):
+    try:
+        os.utime(ruta)  # ✅ marca el acceso para el LRU
+    except OSError:
+        pass
+
+
+def evict(carpeta, patron, limite, conservar=None, borrar=None):
+    """
+    ✅ Borra los archivos menos usados (por fecha de acceso) hasta
+    ✅ quedar bajo `limite` bytes. `borrar(ruta)` permite limpiar extras.
+    """
+    archivos = []
+    total = 0
+    for ruta in carpeta.glob(patron):
+        try:
+            st = ruta.stat()
+        except FileNotFoundError:
+            continue
+        archivos.append((st.st_mtime, st.st_size, ruta))
+        total += st.st_size
+
+    if total <= limite:
+        return
+
+    archivos.sort()
+    for _, size, ruta in archivos:
+        if total <= limite:
+            break
+        if ruta.stem == conservar:
+            continue
+        try:
+            if borrar:
+                borrar(ruta)
+            else:
+                ruta.unlink()
+            total -= size
+        except FileNotFoundError:
+            pass
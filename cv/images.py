@@ -0,0 +1,199 @@
+import hashlib
+from io import BytesIO
+from pathlib import Path, PurePath
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+from .disk_cache import escribir_atomico, evict, tocar
+
+
+# ======================================================
+# ✅ CONFIGURACIÓN
+# ======================================================
+def _cache_dir():
+    ruta = Path(getattr(settings, "CV_IMAGE_CACHE_DIR", Path(settings.BASE_DIR) / ".cache" / "imagenes"))
+    ruta.mkdir(parents=True, exist_ok=True)
+    return ruta
+
+
+def _max_bytes():
+    return getattr(settings, "CV_IMAGE_CACHE_MAX_BYTES", 200 * 1024 * 1024)
+
+
+def _dpi():
+    return getattr(settings, "CV_PDF_IMAGE_DPI", 150)
+
+
+def _calidad():
+    return getattr(settings, "CV_PDF_IMAGE_QUALITY", 80)
+
+
+# ======================================================
+# ✅ REDUCCIÓN + RECOMPRESIÓN PARA EL PDF
+# ======================================================
+def _aplanar(img):
+    """✅ Transparencia sobre fondo blanco (JPEG no tiene canal alfa)."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        fondo = Image.new("RGB", img.size, (255, 255, 255))
+        fondo.paste(img, mask=img.getchannel("A"))
+        return fondo
+    if img.mode not in ("RGB", "L"):
+        return img.convert("RGB")
+    return img
+
+
+def _procesar(data, max_px_w, max_px_h, calidad):
+    with Image.open(BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        img = _aplanar(img)
+        # ✅ solo se reduce; nunca se agranda
+        img.thumbnail((max_px_w, max_px_h), Image.LANCZOS)
+
+        salida = BytesIO()
+        img.save(salida, format="JPEG", quality=calidad, optimize=True, progressive=True)
+        return salida.getvalue()
+
+
+def preparar_imagen(data, ancho_pt, alto_pt):
+    """
+    ✅ Ajusta la imagen a la caja donde se dibuja (en puntos) a la
+    ✅ resolución de impresión, y la reescribe como JPEG.
+    ✅ Si Pillow no puede abrirla, devuelve los bytes originales.
+    """
+    if not data:
+        return data
+
+    dpi = _dpi()
+    calidad = _calidad()
+    max_px_w = max(1, round(ancho_pt / 72 * dpi))
+    max_px_h = max(1, round(alto_pt / 72 * dpi))
+
+    # ✅ clave: contenido original + tamaño destino + calidad
+    clave = hashlib.sha256(data).hexdigest()[:40] + f"-{max_px_w}x{max_px_h}-q{calidad}"
+    ruta = _cache_dir() / f"{clave}.jpg"
+
+    try:
+        with open(ruta, "rb") as f:
+            derivada = f.read()
+        tocar(ruta)
+        return derivada
+    except OSError:
+        pass
+
+    try:
+        derivada = _procesar(data, max_px_w, max_px_h, calidad)
+    except Exception:
+        return data
+
+    # ✅ un JPEG ya chico puede crecer al recomprimir
+    if len(derivada) >= len(data):
+        derivada = data
+
+    try:
+        escribir_atomico(ruta, derivada)
+        evict(_cache_dir(), "*.jpg", _max_bytes(), conservar=ruta.stem)
+    except OSError:
+        pass
+    return derivada
+
+
+# ======================================================
+# ✅ MINIATURAS WEB (ver cv/responsive.py)
+# ======================================================
+FORMATO_PIL = {"avif": "AVIF", "webp": "WEBP", "jpg": "JPEG"}
+
+
+def _calidad_web():
+    return getattr(settings, "CV_IMAGE_WEB_QUALITY", 75)
+
+
+def _derivadas_dir():
+    ruta = _cache_dir() / "derivadas"
+    ruta.mkdir(parents=True, exist_ok=True)
+    return ruta
+
+
+def ruta_derivada(archivo, ancho, formato):
+    """
+    ✅ Ruta en disco de la miniatura (ancho px, formato); la genera si falta.
+    ✅ None si el original no se puede leer o Pillow no puede abrirlo.
+    """
+    base = f"{type(archivo.storage).__name__}:{archivo.name}"
+    clave = hashlib.sha256(base.encode("utf-8")).hexdigest()[:40] + f"-w{ancho}-q{_calidad_web()}"
+    ruta = _derivadas_dir() / f"{clave}.{formato}"
+    if ruta.exists():
+        tocar(ruta)
+        return ruta
+
+    try:
+        with archivo.storage.open(archivo.name, "rb") as f:
+            data = f.read()
+        with Image.open(BytesIO(data)) as img:
+            img = ImageOps.exif_transpose(img)
+            if formato == "jpg":
+                img = _aplanar(img)
+            elif img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+            img.thumbnail((ancho, ancho * 4), Image.LANCZOS)
+
+            salida = BytesIO()
+            opciones = {"quality": _calidad_web()}
+            if formato == "jpg":
+                opciones.update(optimize=True, progressive=True)
+            img.save(salida, format=FORMATO_PIL[formato], **opciones)
+    except Exception:
+        return None
+
+    try:
+        escribir_atomico(ruta, salida.getvalue())
+        evict(_derivadas_dir(), "*.*", _max_bytes(), conservar=ruta.stem)
+    except OSError:
+        return None
+    return ruta
+
+
+# ======================================================
+# ✅ FOTOS SUBIDAS (ANTES DE IR AL STORAGE)
+# ======================================================
+def _foto_max_px():
+    return getattr(settings, "CV_FOTO_MAX_PX", 1600)
+
+
+def _foto_calidad():
+    return getattr(settings, "CV_FOTO_QUALITY", 85)
+
+
+def normalizar_foto(archivo):
+    """
+    ✅ (nombre, bytes) de la foto lista para guardar: orientación EXIF
+    ✅ aplicada, sin metadatos, lado mayor <= CV_FOTO_MAX_PX y recomprimida
+    ✅ (JPEG; PNG si tiene transparencia).
+    ✅ Si Pillow no puede abrirla, devuelve el archivo tal cual.
+    """
+    archivo.seek(0)
+    data = archivo.read()
+    base = PurePath(archivo.name).stem or "foto"
+
+    try:
+        with Image.open(BytesIO(data)) as img:
+            # ✅ JPEG: el decodificador ya reduce (1/2, 1/4, 1/8) sin bajar del tamaño final
+            escala = min(1, _foto_max_px() / max(img.size))
+            img.draft("RGB", (round(img.width * escala), round(img.height * escala)))
+            img.thumbnail((_foto_max_px(), _foto_max_px()), Image.LANCZOS)
+            img = ImageOps.exif_transpose(img)
+            alfa = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+
+            # ✅ se reescribe sin exif=...: GPS, cámara, etc. no se guardan
+            salida = BytesIO()
+            if alfa:
+                img.convert("RGBA").save(salida, format="PNG", optimize=True)
+                extension = ".png"
+            else:
+                _aplanar(img).save(salida, format="JPEG", quality=_foto_calidad(), optimize=True, progressive=True)
+                extension = ".jpg"
+    except Exception:
+        return archivo.name, data
+
+    return f"{base}{extension}", salida.getvalue()
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import pdf_cache
+from .models import TrabajoPDF
+from .renderers import get_renderer, nombre_motor
+
+
+# ======================================================
+# ✅ COLA DE PDFs EN LA BASE DE DATOS (SIN BROKER EXTERNO)
+# ======================================================
+def encolar(perfil, secciones, certificados_tokens, motor=None):
+    """✅ Crea el trabajo; si el PDF ya está en caché queda listo al instante."""
+    secciones = pdf_cache.normalizar_secciones(secciones)
+    certificados_tokens = pdf_cache.normalizar_tokens(certificados_tokens)
+    motor = nombre_motor(motor)
+
+    trabajo = TrabajoPDF(
+        perfil=perfil, secciones=secciones, certificados=certificados_tokens, motor=motor
+    )
+
+    clave = pdf_cache.cache_key(perfil, secciones, certificados_tokens, motor)
+    archivo = pdf_cache.abrir(clave)
+    if archivo is not None:
+        archivo.close()
+        trabajo.estado = "listo"
+        trabajo.progreso = 100
+        trabajo.clave = clave
+
+    trabajo.save()
+    return trabajo
+
+
+def reclamar():
+    """
+    ✅ Toma el trabajo pendiente más antiguo.
+    ✅ El UPDATE condicionado evita que dos workers tomen el mismo
+    ✅ (funciona igual en SQLite y PostgreSQL).
+    """
+    while True:
+        pk = (
+            TrabajoPDF.objects.filter(estado="pendiente")
+            .order_by("creado")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        tomados = TrabajoPDF.objects.filter(pk=pk, estado="pendiente").update(
+            estado="procesando", progreso=0, actualizado=timezone.now()
+        )
+        if tomados == 1:
+            return TrabajoPDF.objects.select_related("perfil").get(pk=pk)
+
+
+def recuperar_colgados():
+    """✅ Devuelve a la cola los trabajos de un worker que murió a mitad."""
+    limite = timezone.now() - timedelta(seconds=getattr(settings, "CV_PDF_JOB_TIMEOUT", 600))
+    return TrabajoPDF.objects.filter(estado="procesando", actualizado__lt=limite).update(
+        estado="pendiente", progreso=0
+    )
+
+
+def purgar_terminados():
+    """✅ Borra los trabajos listos o con error de hace más de CV_PDF_JOB_RETENCION_DIAS."""
+    limite = timezone.now() - timedelta(days=getattr(settings, "CV_PDF_JOB_RETENCION_DIAS", 7))
+    borrados, _ = TrabajoPDF.objects.filter(
+        estado__in=("listo", "error"), actualizado__lt=limite
+    ).delete()
+    return borrados
+
+
+def procesar(trabajo):
+    def progreso(pct):
+        TrabajoPDF.objects.filter(pk=trabajo.pk).update(
+            progreso=min(pct, 99), actualizado=timezone.now()
+        )
+
+    try:
+        motor = nombre_motor(trabajo.motor)
+        clave = pdf_cache.cache_key(trabajo.perfil, trabajo.secciones, trabajo.certificados, motor)
+        # ✅ si faltó una imagen, el PDF queda solo para este trabajo
+        # ✅ (la próxima descarga normal vuelve a intentarlo)
+        archivo, clave = pdf_cache.generar(
+            clave,
+            lambda f: get_renderer(motor).render(
+                f, trabajo.perfil, trabajo.secciones, trabajo.certificados, progreso=progreso
+            ),
+            clave_parcial=f"{clave}-{trabajo.token.hex[:12]}",
+        )
+        if archivo is not None:
+            archivo.close()
+        if clave is None:
+            # ✅ la descarga lee el PDF de la caché: sin disco no hay resultado
+            raise OSError("No se pudo guardar el PDF en la caché de disco.")
+    except Exception as e:
+        TrabajoPDF.objects.filter(pk=trabajo.pk).update(
+            estado="error", error=str(e)[:2000], actualizado=timezone.now()
+        )
+        return False
+
+    TrabajoPDF.objects.filter(pk=trabajo.pk).update(
+        estado="listo", progreso=100, clave=clave, error="", actualizado=timezone.now()
+    )
+    return True
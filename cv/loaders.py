@@ -0,0 +1,101 @@
+from django.db.models import Prefetch, prefetch_related_objects
+
+from .models import (
+    ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales, VentaGarage
+)
+
+
+# ======================================================
+# ✅ SECCIONES VISIBLES DEL PERFIL
+# ✅ El perfil llega ya resuelto (request.perfil, ver active_profile.py)
+#
+# ✅ Presupuesto de consultas (fijo, no crece con los datos):
+# ✅   "cv"     -> 5 (secciones)
+# ✅             (solo al reconstruir el snapshot, ver snapshots.py)
+# ✅   "pdf"    -> 1 por sección pedida                    <= 5
+# ✅             (+ máx. 4 de anexos en resolver_anexos)
+# ✅   "garage" -> 1 (una página de productos, ver pagination.py)
+# ======================================================
+
+# ✅ atributo en el perfil -> (modelo, relación inversa)
+# ✅ ("reconocimientos" choca con el nombre de la relación inversa)
+RELACIONES = {
+    "experiencia": (ExperienciaLaboral, "experiencialaboral_set"),
+    "cursos": (CursosRealizados, "cursosrealizados_set"),
+    "reconocimientos_cv": (Reconocimientos, "reconocimientos_set"),
+    "productos_academicos": (ProductosAcademicos, "productosacademicos_set"),
+    "productos_laborales": (ProductosLaborales, "productoslaborales_set"),
+    "garage": (VentaGarage, "ventagarage_set"),
+}
+
+# ✅ solo las columnas que cada vista muestra
+CAMPOS = {
+    "cv": {
+        "experiencia": ("cargodesempenado", "nombrempresa", "descripcionfunciones"),
+        "cursos": (
+            "nombrecurso", "totalhoras", "descripcioncurso",
+            "fechainicio", "fechafin", "rutacertificado",
+        ),
+        "reconocimientos_cv": (
+            "tiporeconocimiento", "descripcionreconocimiento", "fechareconocimiento",
+            "entidadpatrocinadora", "rutacertificado",
+        ),
+        "productos_academicos": ("nombrerecurso", "clasificador", "descripcion", "rutacertificado"),
+        "productos_laborales": ("nombreproducto", "fechaproducto", "descripcion", "rutacertificado"),
+    },
+    "pdf": {
+        "experiencia": ("cargodesempenado", "nombrempresa", "lugarempresa", "descripcionfunciones"),
+        "cursos": ("nombrecurso", "totalhoras", "fechainicio", "fechafin", "descripcioncurso"),
+        "reconocimientos_cv": ("tiporeconocimiento", "descripcionreconocimiento", "entidadpatrocinadora"),
+        "productos_academicos": ("nombrerecurso", "clasificador", "descripcion"),
+        "productos_laborales": ("nombreproducto", "fechaproducto", "descripcion"),
+    },
+    "garage": {
+        "garage": (
+            "nombreproducto", "valordelbien", "estadoproducto", "condicion",
+            "fotoproducto", "descripcion", "fecha_publicacion",
+        ),
+    },
+}
+
+# ✅ sección del PDF (?sec=) -> atributo
+SECCION_A_ATRIBUTO = {
+    "experiencia": "experiencia",
+    "cursos": "cursos",
+    "reconocimientos": "reconocimientos_cv",
+    "prod_academicos": "productos_academicos",
+    "prod_laborales": "productos_laborales",
+}
+
+
+def _atributos(vista, secciones=None):
+    atributos = list(CAMPOS[vista])
+    if secciones is not None:
+        pedidos = {SECCION_A_ATRIBUTO[s] for s in secciones if s in SECCION_A_ATRIBUTO}
+        atributos = [a for a in atributos if a in pedidos]
+    return atributos
+
+
+def visibles(vista, atributo):
+    """✅ Filas visibles de una sección, solo con las columnas de la vista."""
+    modelo, _ = RELACIONES[atributo]
+    # ✅ la FK es necesaria para unir el prefetch con el perfil
+    return modelo.objects.filter(activarparaqueseveaenfront=True).only("perfil", *CAMPOS[vista][atributo])
+
+
+def prefetches(vista, secciones=None):
+    return [
+        Prefetch(RELACIONES[atributo][1], queryset=visibles(vista, atributo), to_attr=atributo)
+        for atributo in _atributos(vista, secciones)
+    ]
+
+
+def completar(perfil, vista, secciones=None):
+    """✅ Carga en el perfil las secciones que le falten (to_attr)."""
+    if not perfil:
+        return perfil
+    faltan = [p for p in prefetches(vista, secciones) if not hasattr(perfil, p.to_attr)]
+    if faltan:
+        prefetch_related_objects([perfil], *faltan)
+    return perfil
@@ -0,0 +1,149 @@
+import statistics
+import time
+import tracemalloc
+from datetime import date
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cv.models import (
+    DatosPersonales, ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales
+)
+from cv.pdf_cache import SECCIONES_PDF
+from cv.renderers import RENDERERS
+
+
+# ======================================================
+# ✅ DATOS FIJOS (SE CREAN Y SE DESHACEN EN UNA TRANSACCIÓN)
+# ======================================================
+def _cedula_libre():
+    # ✅ el benchmark puede correr sobre la base real: no chocar con la unique
+    usadas = set(DatosPersonales.objects.values_list("numerocedula", flat=True))
+    for i in range(10 ** 6):
+        cedula = f"{9999999999 - i:010d}"
+        if cedula not in usadas:
+            return cedula
+
+
+def crear_fixture(n):
+    """✅ Devuelve el id del perfil creado."""
+    # ✅ bulk_create: sin señales, así el benchmark no invalida las cachés
+    # ✅ reales (versiones, PDFs, media) aunque luego se deshaga todo
+    cedula = _cedula_libre()
+    DatosPersonales.objects.bulk_create([DatosPersonales(
+        descripcionperfil="Desarrollador", perfilactivo=0,
+        apellidos="Benchmark", nombres="Perfil", nacionalidad="Ecuatoriana",
+        lugarnacimiento="Manta", numerocedula=cedula, sexo="H",
+        estadocivil="Soltero", direcciondomiciliaria="Av. Principal",
+    )])
+    perfil_id = DatosPersonales.objects.get(numerocedula=cedula).pk
+
+    texto = "Desarrollo de sistemas web con Django, reportes y atención a usuarios. " * 2
+    ExperienciaLaboral.objects.bulk_create([
+        ExperienciaLaboral(
+            perfil_id=perfil_id, cargodesempenado=f"Cargo {i}", nombrempresa="Empresa",
+            lugarempresa="Manta", fechainiciogestion=date(2020, 1, 1),
+            descripcionfunciones=texto[:200],
+        )
+        for i in range(n)
+    ])
+    CursosRealizados.objects.bulk_create([
+        CursosRealizados(
+            perfil_id=perfil_id, nombrecurso=f"Curso {i}", fechainicio=date(2021, 1, 1),
+            fechafin=date(2021, 2, 1), totalhoras=40, descripcioncurso=texto[:100],
+            entidadpatrocinadora="Entidad",
+        )
+        for i in range(n)
+    ])
+    Reconocimientos.objects.bulk_create([
+        Reconocimientos(
+            perfil_id=perfil_id, tiporeconocimiento="Académico", fechareconocimiento=date(2022, 1, 1),
+            descripcionreconocimiento=f"Reconocimiento {i}", entidadpatrocinadora="Entidad",
+        )
+        for i in range(n)
+    ])
+    ProductosAcademicos.objects.bulk_create([
+        ProductosAcademicos(
+            perfil_id=perfil_id, nombrerecurso=f"Artículo {i}", clasificador="Revista",
+            descripcion=texto[:200],
+        )
+        for i in range(n)
+    ])
+    ProductosLaborales.objects.bulk_create([
+        ProductosLaborales(
+            perfil_id=perfil_id, nombreproducto=f"Sistema {i}", fechaproducto=date(2023, 1, 1),
+            descripcion=texto[:200],
+        )
+        for i in range(n)
+    ])
+    return perfil_id
+
+
+def perfil_limpio(perfil_id):
+    # ✅ instancia nueva en cada corrida: sin secciones ya cargadas (to_attr),
+    # ✅ el render paga sus consultas como en una petición real
+    return DatosPersonales.objects.get(pk=perfil_id)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compara los motores de PDF (latencia, memoria pico y tamaño) con datos fijos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=10, help="Registros por sección")
+        parser.add_argument("--repeticiones", type=int, default=5)
+        parser.add_argument("--motores", nargs="+", default=list(RENDERERS))
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                perfil_id = crear_fixture(opts["items"])
+                self._medir(perfil_id, opts)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _medir(self, perfil_id, opts):
+        secciones = list(SECCIONES_PDF)
+        self.stdout.write(
+            f"{'motor':<12} {'mediana (ms)':>13} {'p95 (ms)':>9} {'pico (MiB)':>11} {'tamaño (KiB)':>13}"
+        )
+
+        for nombre in opts["motores"]:
+            renderer = RENDERERS.get(nombre)
+            if renderer is None:
+                self.stderr.write(f"⚠️ Motor desconocido: {nombre}")
+                continue
+
+            # ✅ una corrida de calentamiento (fuentes, estilos, imports)
+            try:
+                renderer.render(BytesIO(), perfil_limpio(perfil_id), secciones, [])
+            except Exception as e:
+                self.stdout.write(f"{nombre:<12} no disponible: {e}")
+                continue
+
+            tiempos, picos, tamano = [], [], 0
+            for _ in range(opts["repeticiones"]):
+                salida = BytesIO()
+                perfil = perfil_limpio(perfil_id)
+                tracemalloc.start()
+                inicio = time.perf_counter()
+                renderer.render(salida, perfil, secciones, [])
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+                picos.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+                tamano = len(salida.getvalue())
+
+            tiempos.sort()
+            p95 = tiempos[min(len(tiempos) - 1, int(round(0.95 * (len(tiempos) - 1))))]
+            self.stdout.write(
+                f"{nombre:<12} {statistics.median(tiempos):>13.1f} {p95:>9.1f} "
+                f"{max(picos) / 1024 / 1024:>11.2f} {tamano / 1024:>13.1f}"
+            )
+
+        self.stdout.write("ℹ️ La memoria pico es la de Python (tracemalloc), sin librerías nativas.")
@@ -0,0 +1,88 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from cv.text_layout import layout_text, tabla_anchos
+
+
+# ======================================================
+# ✅ ALGORITMO ANTERIOR (PREFIJO CRECIENTE + DOBLE PASADA)
+# ======================================================
+def legacy_card(texto, font, size, max_width):
+    palabras = str(texto).split()
+
+    # ✅ pasada 1: contar líneas para el alto
+    linea = ""
+    lineas = 1
+    for w in palabras:
+        prueba = (linea + " " + w).strip()
+        if stringWidth(prueba, font, size) <= max_width:
+            linea = prueba
+        else:
+            lineas += 1
+            linea = w
+
+    # ✅ pasada 2: volver a partir para dibujar
+    salida = []
+    linea = ""
+    for w in palabras:
+        prueba = (linea + " " + w).strip()
+        if stringWidth(prueba, font, size) <= max_width:
+            linea = prueba
+        else:
+            salida.append(linea)
+            linea = w
+    if linea:
+        salida.append(linea)
+    return lineas, salida
+
+
+def nuevo_card(texto, font, size, max_width):
+    parrafo = layout_text(texto, font=font, size=size, leading=12, max_width=max_width)
+    return len(parrafo.lineas), parrafo.lineas
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark del corte de líneas del PDF (anterior vs. nuevo)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cards", type=int, default=200, help="Tarjetas por corrida")
+        parser.add_argument("--words", type=int, nargs="+", default=[20, 200, 2000],
+                            help="Palabras por descripción")
+        parser.add_argument("--width", type=float, default=480.0, help="Ancho de línea en puntos")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        vocab = [
+            "gestión", "desarrollo", "de", "sistemas", "Django", "atención", "al", "cliente",
+            "coordinación", "proyectos", "y", "análisis", "datos", "reportes", "soporte", "técnico",
+        ]
+        font, size, width = "Helvetica", 9, opts["width"]
+
+        self.stdout.write(f"{'palabras':>9} {'anterior (ms)':>14} {'nuevo (ms)':>11} {'x':>7}")
+        for n in opts["words"]:
+            textos = [" ".join(rng.choice(vocab) for _ in range(n)) for _ in range(opts["cards"])]
+
+            # ✅ mismo resultado antes de medir
+            for t in textos[:5]:
+                if legacy_card(t, font, size, width)[1] != nuevo_card(t, font, size, width)[1]:
+                    self.stderr.write(f"⚠️ Diferencia de líneas con {n} palabras")
+                    break
+
+            tabla_anchos.cache_clear()
+
+            inicio = time.perf_counter()
+            for t in textos:
+                legacy_card(t, font, size, width)
+            t_legacy = (time.perf_counter() - inicio) * 1000
+
+            inicio = time.perf_counter()
+            for t in textos:
+                nuevo_card(t, font, size, width)
+            t_nuevo = (time.perf_counter() - inicio) * 1000
+
+            factor = t_legacy / t_nuevo if t_nuevo else float("inf")
+            self.stdout.write(f"{n:>9} {t_legacy:>14.1f} {t_nuevo:>11.1f} {factor:>6.1f}x")
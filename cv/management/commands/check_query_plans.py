@@ -0,0 +1,198 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from cv.loaders import prefetches, visibles
+from cv.models import (
+    DatosPersonales, ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales, VentaGarage, PerfilSnapshot
+)
+from cv.pagination import codificar_cursor, tramos_keyset
+from cv.search import buscar_garage
+
+
+# ======================================================
+# ✅ DATOS DE VOLUMEN (SE CREAN Y SE DESHACEN EN UNA TRANSACCIÓN)
+# ======================================================
+def _cedulas_libres(n):
+    usadas = set(DatosPersonales.objects.values_list("numerocedula", flat=True))
+    libres = []
+    i = 0
+    while len(libres) < n:
+        cedula = f"{9999999999 - i:010d}"
+        if cedula not in usadas:
+            libres.append(cedula)
+        i += 1
+    return libres
+
+
+def sembrar(perfiles, filas):
+    # ✅ bulk_create: sin full_clean ni señales, solo volumen
+    DatosPersonales.objects.bulk_create([
+        DatosPersonales(
+            descripcionperfil="Plan", perfilactivo=0, apellidos="Plan", nombres=f"Perfil {i}",
+            nacionalidad="Ecuatoriana", lugarnacimiento="Manta", numerocedula=cedula,
+            sexo="H", estadocivil="Soltero", direcciondomiciliaria="Av. Principal",
+        )
+        for i, cedula in enumerate(_cedulas_libres(perfiles))
+    ], batch_size=500)
+    ids = list(DatosPersonales.objects.filter(descripcionperfil="Plan").values_list("pk", flat=True))
+
+    def visible(j):
+        # ✅ ~1 de cada 4 oculto: los índices parciales tienen algo que descartar
+        return j % 4 != 0
+
+    fabricas = [
+        lambda pid, j: ExperienciaLaboral(
+            perfil_id=pid, cargodesempenado=f"Cargo {j}", nombrempresa="Empresa", lugarempresa="Manta",
+            fechainiciogestion=date(2020, 1, 1), descripcionfunciones="Funciones",
+            activarparaqueseveaenfront=visible(j),
+        ),
+        lambda pid, j: CursosRealizados(
+            perfil_id=pid, nombrecurso=f"Curso {j}", fechainicio=date(2021, 1, 1), fechafin=date(2021, 2, 1),
+            totalhoras=40, descripcioncurso="Curso", entidadpatrocinadora="Entidad",
+            activarparaqueseveaenfront=visible(j),
+        ),
+        lambda pid, j: Reconocimientos(
+            perfil_id=pid, tiporeconocimiento="Académico", fechareconocimiento=date(2022, 1, 1),
+            descripcionreconocimiento=f"Reconocimiento {j}", entidadpatrocinadora="Entidad",
+            activarparaqueseveaenfront=visible(j),
+        ),
+        lambda pid, j: ProductosAcademicos(
+            perfil_id=pid, nombrerecurso=f"Artículo {j}", clasificador="Revista", descripcion="Artículo",
+            activarparaqueseveaenfront=visible(j),
+        ),
+        lambda pid, j: ProductosLaborales(
+            perfil_id=pid, nombreproducto=f"Sistema {j}", fechaproducto=date(2023, 1, 1), descripcion="Sistema",
+            activarparaqueseveaenfront=visible(j),
+        ),
+        lambda pid, j: VentaGarage(
+            perfil_id=pid, nombreproducto=f"Producto {j}", valordelbien=j % 50, descripcion="Producto",
+            estadoproducto="Vendido" if j % 3 == 0 else "Disponible", condicion="Regular" if j % 2 else "Bueno",
+            activarparaqueseveaenfront=visible(j),
+        ),
+    ]
+    for fabrica in fabricas:
+        objs = [fabrica(pid, j) for pid in ids for j in range(filas)]
+        type(objs[0]).objects.bulk_create(objs, batch_size=1000)
+
+    # ✅ el perfil "activo" queda en medio de la tabla, no en la primera página
+    objetivo = ids[len(ids) // 2]
+    DatosPersonales.objects.filter(pk=objetivo).update(perfilactivo=1)
+    PerfilSnapshot.objects.bulk_create([PerfilSnapshot(perfil_id=pid, documento={}) for pid in ids])
+    return objetivo
+
+
+# ======================================================
+# ✅ LECTURA DEL PLAN SEGÚN EL MOTOR
+# ======================================================
+def usa_indice(plan, tabla, ordenada):
+    """✅ None si el motor no se sabe leer; si no, (ok, motivo)."""
+    if connection.vendor == "sqlite":
+        lineas = [l for l in plan.splitlines() if f" {tabla} " in f"{l} " or "TEMP B-TREE" in l]
+        for l in lineas:
+            if f"SCAN {tabla}" in l:
+                return False, "recorre la tabla completa"
+        if ordenada and any("TEMP B-TREE" in l for l in lineas):
+            return False, "ordena en memoria (el índice no da el orden)"
+        if not any("SEARCH" in l for l in lineas):
+            return False, "no aparece búsqueda por índice"
+        return True, ""
+
+    if connection.vendor == "postgresql":
+        if f"Seq Scan on {tabla}" in plan:
+            return False, "Seq Scan"
+        if "Index" not in plan:
+            return False, "no aparece Index Scan"
+        return True, ""
+
+    return None
+
+
+# ======================================================
+# ✅ CONSULTAS A VERIFICAR (TAMBIÉN LAS USA cv/tests.py)
+# ======================================================
+def consultas(objetivo):
+    """✅ [(nombre, queryset, ordenada)] de las lecturas públicas sobre el perfil `objetivo`."""
+    lista = [
+        # ✅ la que hace active_profile.py cuando cambia la versión
+        ("perfil activo", DatosPersonales.objects.filter(perfilactivo=1).order_by("pk")[:1], False),
+        ("snapshot", PerfilSnapshot.objects.filter(pk=objetivo).only("documento")[:1], False),
+    ]
+    # ✅ las mismas consultas que arma cv/loaders.py
+    for p in prefetches("cv"):
+        qs = p.queryset.filter(perfil__in=[objetivo])
+        lista.append((f"cv:{p.to_attr}", qs, qs.ordered))
+
+    # ✅ /garage/: primera página, página profunda y cada filtro
+    base = visibles("garage", "garage").filter(perfil=objetivo)
+    fondo = base.order_by("-fecha_publicacion", "-pk")[base.count() // 2]
+    cursor = codificar_cursor(fondo.fecha_publicacion, fondo.pk)
+    for nombre, qs, desde, ordenada in [
+        ("garage:primera", base, None, True),
+        ("garage:profunda", base, cursor, True),
+        ("garage:estado", base.filter(estadoproducto="Disponible"), None, True),
+        ("garage:condicion", base.filter(condicion="Bueno"), None, True),
+        # ✅ un rango de precio y el orden por fecha no caben en un mismo
+        # ✅ índice: se busca por precio y se ordena solo lo filtrado
+        ("garage:precio", base.filter(valordelbien__gte=5, valordelbien__lte=20), None, False),
+        # ✅ texto completo (FTS5 / tsvector): se busca por el índice de texto
+        ("garage:busqueda", buscar_garage(base, "producto 7"), None, False),
+    ]:
+        for n, tramo in enumerate(tramos_keyset(qs, "fecha_publicacion", desde), start=1):
+            lista.append((f"{nombre} ({n})", tramo[:25], ordenada))
+    return lista
+
+
+def revisar(objetivo):
+    """✅ (nombre, plan, resultado de usa_indice) por cada consulta."""
+    for nombre, qs, ordenada in consultas(objetivo):
+        plan = qs.explain()
+        yield nombre, plan, usa_indice(plan, qs.model._meta.db_table, ordenada)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Siembra volumen y verifica con EXPLAIN que las consultas públicas usen índices"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--perfiles", type=int, default=200)
+        parser.add_argument("--filas", type=int, default=50, help="Filas por sección y perfil")
+
+    def handle(self, *args, **opts):
+        self.verbosity = opts["verbosity"]
+        fallos = []
+        try:
+            with transaction.atomic():
+                objetivo = sembrar(opts["perfiles"], opts["filas"])
+                with connection.cursor() as cursor:
+                    # ✅ estadísticas frescas para que el planificador vea el volumen
+                    cursor.execute("ANALYZE")
+                fallos = self._verificar(objetivo)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        if fallos:
+            raise CommandError(f"{len(fallos)} consulta(s) sin índice: {', '.join(fallos)}")
+
+    def _verificar(self, objetivo):
+        fallos = []
+        for nombre, plan, resultado in revisar(objetivo):
+            if resultado is None:
+                self.stdout.write(f"ℹ️ {nombre:<28} {connection.vendor}: no verificado")
+                continue
+
+            ok, motivo = resultado
+            if ok:
+                self.stdout.write(f"✅ {nombre:<28} usa índice")
+            else:
+                fallos.append(nombre)
+                self.stdout.write(f"❌ {nombre:<28} {motivo}")
+            if self.verbosity > 1:
+                self.stdout.write(plan)
+        return fallos
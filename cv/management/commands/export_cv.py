@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cv import transfer
+
+
+class Command(BaseCommand):
+    help = "Exporta los datos del CV a <carpeta>/<modelo>.jsonl|csv (un archivo por modelo)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("carpeta", help="Carpeta de salida (se crea si no existe)")
+        parser.add_argument("--formato", choices=transfer.FORMATOS, default="jsonl")
+        parser.add_argument("--chunk-size", type=int, default=2000,
+                            help="Filas que se traen de la base de datos por vuelta")
+        parser.add_argument("--modelos", nargs="*", default=[],
+                            help="Nombres de modelo (por defecto, todos)")
+
+    def handle(self, *args, **opts):
+        modelos = [transfer.modelo_por_nombre(n) for n in opts["modelos"]] or list(transfer.MODELOS)
+        if None in modelos:
+            raise CommandError(f"Modelos válidos: {', '.join(m._meta.model_name for m in transfer.MODELOS)}")
+
+        carpeta = Path(opts["carpeta"])
+        carpeta.mkdir(parents=True, exist_ok=True)
+
+        for modelo in modelos:
+            ruta = carpeta / transfer.nombre_archivo(modelo, opts["formato"])
+            with open(ruta, "w", encoding="utf-8", newline="") as f:
+                n = transfer.exportar(modelo, f, opts["formato"], opts["chunk_size"])
+            self.stdout.write(f"✅ {modelo.__name__}: {n} fila(s) -> {ruta}")
@@ -0,0 +1,58 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from cv import signals, transfer
+
+
+class Command(BaseCommand):
+    help = "Importa <carpeta>/<modelo>.jsonl|csv por lotes (reimportar actualiza, no duplica)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("carpeta", help="Carpeta generada por export_cv")
+        parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Filas por lote de validación y de bulk_create")
+        parser.add_argument("--max-errores", type=int, default=50,
+                            help="Errores que se muestran antes de cortar el listado")
+
+    def _archivos(self, carpeta):
+        for modelo in transfer.MODELOS:
+            for formato in transfer.FORMATOS:
+                ruta = carpeta / transfer.nombre_archivo(modelo, formato)
+                if ruta.exists():
+                    yield modelo, ruta, formato
+                    break
+
+    def handle(self, *args, **opts):
+        carpeta = Path(opts["carpeta"])
+        archivos = list(self._archivos(carpeta))
+        if not archivos:
+            raise CommandError(f"No hay archivos para importar en {carpeta}")
+
+        inicio = time.monotonic()
+        modelos = []
+        perfil_ids = set()
+
+        # ✅ todo o nada: un error en cualquier archivo deshace la importación
+        with transaction.atomic():
+            for modelo, ruta, formato in archivos:
+                with open(ruta, encoding="utf-8", newline="") as f:
+                    filas, perfiles, errores = transfer.importar(modelo, f, formato, opts["chunk_size"])
+
+                if errores:
+                    for linea in sorted(errores)[:opts["max_errores"]]:
+                        for campo, mensajes in errores[linea].items():
+                            self.stderr.write(f"⚠️ {ruta.name}:{linea} {campo}: {' '.join(mensajes)}")
+                    raise CommandError(f"{len(errores)} fila(s) inválida(s) en {ruta.name}; no se importó nada")
+
+                modelos.append(modelo)
+                perfil_ids |= perfiles
+                self.stdout.write(f"✅ {modelo.__name__}: {filas} fila(s)")
+
+            transfer.reiniciar_secuencias(modelos)
+            # ✅ bulk_create no dispara señales: cachés, versiones y snapshots a mano
+            signals.cambio_masivo(modelos, perfil_ids)
+
+        self.stdout.write(f"✅ Importación completa en {time.monotonic() - inicio:.1f} s")
@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from cv import jobs
+
+
+# ✅ cada cuánto (segundos) un worker recupera colgados y purga terminados
+MANTENIMIENTO_CADA = 60
+
+
+def _mantenimiento():
+    # ✅ idempotente: da igual si varios procesos lo hacen a la vez
+    jobs.recuperar_colgados()
+    jobs.purgar_terminados()
+
+
+def _loop(intervalo, una_vez):
+    # ✅ cada proceso abre su propia conexión a la base de datos
+    connections.close_all()
+    detener = False
+
+    def _salir(*_):
+        nonlocal detener
+        detener = True
+
+    # ✅ termina el trabajo en curso y sale (Ctrl+C también llega a los hijos)
+    signal.signal(signal.SIGTERM, _salir)
+    signal.signal(signal.SIGINT, _salir)
+
+    proximo_mantenimiento = time.monotonic() + MANTENIMIENTO_CADA
+    while not detener:
+        close_old_connections()
+        if time.monotonic() >= proximo_mantenimiento:
+            _mantenimiento()
+            proximo_mantenimiento = time.monotonic() + MANTENIMIENTO_CADA
+
+        trabajo = jobs.reclamar()
+        if trabajo is None:
+            if una_vez:
+                return
+            time.sleep(intervalo)
+            continue
+        jobs.procesar(trabajo)
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de PDFs en segundo plano con un pool de procesos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--procesos", type=int, default=2, help="Procesos en paralelo")
+        parser.add_argument("--intervalo", type=float, default=1.0,
+                            help="Segundos de espera cuando la cola está vacía")
+        parser.add_argument("--una-vez", action="store_true",
+                            help="Vacía la cola y termina (útil en cron)")
+
+    def handle(self, *args, **opts):
+        recuperados = jobs.recuperar_colgados()
+        if recuperados:
+            self.stdout.write(f"↩️ {recuperados} trabajo(s) colgado(s) vuelven a la cola")
+        purgados = jobs.purgar_terminados()
+        if purgados:
+            self.stdout.write(f"🧹 {purgados} trabajo(s) terminado(s) borrados")
+
+        procesos = max(1, opts["procesos"])
+        if procesos == 1:
+            _loop(opts["intervalo"], opts["una_vez"])
+            return
+
+        # ✅ las conexiones no se comparten entre procesos
+        connections.close_all()
+        ctx = multiprocessing.get_context("fork")
+        hijos = [
+            ctx.Process(target=_loop, args=(opts["intervalo"], opts["una_vez"]), daemon=False)
+            for _ in range(procesos)
+        ]
+        for h in hijos:
+            h.start()
+        self.stdout.write(f"✅ {procesos} worker(s) de PDF en marcha")
+
+        senales = 0
+
+        def _reenviar(*_):
+            # ✅ 1ª señal: los hijos terminan su trabajo y salen
+            # ✅ 2ª señal: se matan (recuperar_colgados devuelve sus trabajos a la cola)
+            nonlocal senales
+            senales += 1
+            for h in hijos:
+                if h.is_alive():
+                    os.kill(h.pid, signal.SIGTERM if senales == 1 else signal.SIGKILL)
+
+        # ✅ después de start(): los hijos instalan sus propios manejadores
+        signal.signal(signal.SIGTERM, _reenviar)
+        signal.signal(signal.SIGINT, _reenviar)
+
+        for h in hijos:
+            h.join()
+        self.stdout.write("👋 workers de PDF detenidos")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from cv import snapshots
+from cv.models import DatosPersonales
+
+
+class Command(BaseCommand):
+    help = "Reconstruye los snapshots de todos los perfiles (o de los indicados)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("perfiles", nargs="*", type=int, help="ids de perfil (por defecto, todos)")
+
+    def handle(self, *args, **opts):
+        ids = opts["perfiles"] or list(
+            DatosPersonales.objects.order_by("pk").values_list("pk", flat=True)
+        )
+
+        # ✅ cada perfil en su propia transacción: un error no deshace los demás
+        hechos = 0
+        for perfil_id in ids:
+            if snapshots.reconstruir(perfil_id) is None:
+                self.stderr.write(f"⚠️ Perfil {perfil_id} no existe")
+            else:
+                hechos += 1
+
+        self.stdout.write(f"✅ {hechos} snapshot(s) reconstruido(s)")
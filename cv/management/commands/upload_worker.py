@@ -0,0 +1,44 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from cv import uploads
+
+
+class Command(BaseCommand):
+    help = "Sube al storage las fotos que los formularios dejaron en cola"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--intervalo", type=float, default=1.0,
+                            help="Segundos de espera cuando la cola está vacía")
+        parser.add_argument("--una-vez", action="store_true",
+                            help="Vacía la cola y termina (útil en cron)")
+
+    def handle(self, *args, **opts):
+        recuperadas = uploads.recuperar_colgadas()
+        if recuperadas:
+            self.stdout.write(f"↩️ {recuperadas} subida(s) colgada(s) vuelven a la cola")
+
+        detener = False
+
+        def _salir(*_):
+            nonlocal detener
+            detener = True
+
+        signal.signal(signal.SIGTERM, _salir)
+
+        hechas = 0
+        while not detener:
+            close_old_connections()
+            subida = uploads.reclamar()
+            if subida is None:
+                if opts["una_vez"]:
+                    break
+                time.sleep(opts["intervalo"])
+                continue
+            if uploads.procesar(subida):
+                hechas += 1
+
+        self.stdout.write(f"✅ {hechas} foto(s) subida(s)")
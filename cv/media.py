@@ -0,0 +1,185 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+
+from .disk_cache import escribir_atomico, evict, tocar
+
+
+# ======================================================
+# ✅ CONFIGURACIÓN DE LA CACHÉ DE MEDIA
+# ======================================================
+def _cache_dir():
+    ruta = Path(getattr(settings, "CV_MEDIA_CACHE_DIR", Path(settings.BASE_DIR) / ".cache" / "media"))
+    ruta.mkdir(parents=True, exist_ok=True)
+    return ruta
+
+
+def _max_bytes():
+    return getattr(settings, "CV_MEDIA_CACHE_MAX_BYTES", 500 * 1024 * 1024)
+
+
+def _ttl():
+    # ✅ segundos en los que se confía en la copia local sin revalidar
+    return getattr(settings, "CV_MEDIA_CACHE_TTL", 24 * 60 * 60)
+
+
+# ======================================================
+# ✅ CLAVES: NOMBRE EN EL STORAGE O URL
+# ======================================================
+def clave_de(origen):
+    """✅ Un FieldFile se identifica por su storage + nombre; un str por la URL."""
+    if isinstance(origen, str):
+        base = origen
+    else:
+        base = f"{type(origen.storage).__name__}:{origen.name}"
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def _url_de(origen):
+    if isinstance(origen, str):
+        return origen
+    try:
+        return origen.url
+    except Exception:
+        return None
+
+
+def _rutas(clave):
+    carpeta = _cache_dir()
+    return carpeta / f"{clave}.bin", carpeta / f"{clave}.json"
+
+
+def _leer_meta(ruta_meta):
+    try:
+        with open(ruta_meta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ======================================================
+# ✅ LECTURA A TRAVÉS DE LA CACHÉ
+# ======================================================
+def descargar(origen, timeout=7):
+    """
+    ✅ Bytes del archivo (FieldFile o URL), o None si falla.
+    ✅ Usa la copia en disco y revalida con ETag/Last-Modified cuando expira.
+    """
+    if not origen:
+        return None
+    url = _url_de(origen)
+    if not url:
+        return None
+
+    clave = clave_de(origen)
+    ruta_bin, ruta_meta = _rutas(clave)
+    meta = _leer_meta(ruta_meta)
+
+    data = None
+    if meta is not None:
+        try:
+            with open(ruta_bin, "rb") as f:
+                data = f.read()
+        except OSError:
+            meta, data = None, None
+
+    if data is not None and time.time() - meta.get("verificado", 0) < _ttl():
+        tocar(ruta_bin)
+        return data
+
+    headers = {}
+    if data is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        with urlopen(Request(url, headers=headers), timeout=timeout) as response_img:
+            nuevo = response_img.read()
+            etag = response_img.headers.get("ETag")
+            last_modified = response_img.headers.get("Last-Modified")
+    except HTTPError as e:
+        if e.code == 304 and data is not None:
+            # ✅ sigue igual: solo se renueva la marca de verificación
+            meta["verificado"] = time.time()
+            _guardar_meta(ruta_meta, meta)
+            tocar(ruta_bin)
+            return data
+        return data
+    except Exception:
+        # ✅ sin red: mejor una copia algo vieja que nada
+        return data
+
+    try:
+        escribir_atomico(ruta_bin, nuevo)
+        _guardar_meta(ruta_meta, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "verificado": time.time(),
+        })
+        _evict(conservar=clave)
+    except OSError:
+        pass
+    return nuevo
+
+
+def _guardar_meta(ruta_meta, meta):
+    try:
+        escribir_atomico(ruta_meta, json.dumps(meta).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def _evict(conservar=None):
+    # ✅ los menos usados primero; se borra también su .json
+    evict(
+        _cache_dir(), "*.bin", _max_bytes(), conservar=conservar,
+        borrar=lambda ruta: invalidar_clave(ruta.stem),
+    )
+
+
+def invalidar_clave(clave):
+    for ruta in _rutas(clave):
+        try:
+            ruta.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def invalidar(origen):
+    """✅ Borra la copia local de un FieldFile o URL."""
+    if origen:
+        invalidar_clave(clave_de(origen))
+
+
+# ======================================================
+# ✅ DESCARGA EN PARALELO
+# ======================================================
+def prefetch(origenes):
+    """
+    ✅ Descarga todos los orígenes en paralelo (pool acotado).
+    ✅ Devuelve los bytes en el mismo orden (None si falló).
+    """
+    origenes = list(origenes)
+    claves = [clave_de(o) if o else None for o in origenes]
+
+    unicas = {}
+    for clave, origen in zip(claves, origenes):
+        if clave and clave not in unicas:
+            unicas[clave] = origen
+    if not unicas:
+        return [None] * len(origenes)
+
+    max_workers = min(getattr(settings, "CV_MEDIA_FETCH_WORKERS", 8), len(unicas))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        resultados = dict(zip(unicas, pool.map(descargar, unicas.values())))
+
+    return [resultados.get(c) if c else None for c in claves]
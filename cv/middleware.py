@@ -0,0 +1,13 @@
+from .active_profile import perfil_activo
+
+
+# ======================================================
+# ✅ request.perfil PARA TODAS LAS VISTAS
+# ======================================================
+class PerfilActivoMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.perfil = perfil_activo()
+        return self.get_response(request)
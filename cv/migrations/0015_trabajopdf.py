@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-17 23:35
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0014_alter_ventagarage_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoPDF',
+            fields=[
+                ('idtrabajopdf', models.AutoField(primary_key=True, serialize=False)),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('secciones', models.JSONField(blank=True, default=list)),
+                ('certificados', models.JSONField(blank=True, default=list)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('listo', 'Listo'), ('error', 'Error')], default='pendiente', max_length=20)),
+                ('progreso', models.PositiveSmallIntegerField(default=0)),
+                ('clave', models.CharField(blank=True, default='', max_length=80)),
+                ('error', models.TextField(blank=True, default='')),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+                ('perfil', models.ForeignKey(db_column='idperfilconqueestaactivo', on_delete=django.db.models.deletion.CASCADE, to='cv.datospersonales')),
+            ],
+            options={
+                'db_table': 'trabajospdf',
+                'ordering': ['creado'],
+                'indexes': [models.Index(fields=['estado', 'creado'], name='trabajopdf_estado_creado')],
+            },
+        ),
+    ]
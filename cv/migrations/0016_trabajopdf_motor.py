@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0015_trabajopdf'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trabajopdf',
+            name='motor',
+            field=models.CharField(default='reportlab', max_length=20),
+        ),
+    ]
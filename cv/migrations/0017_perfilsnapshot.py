@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-18 00:10
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0016_trabajopdf_motor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerfilSnapshot',
+            fields=[
+                ('perfil', models.OneToOneField(db_column='idperfil', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='cv.datospersonales')),
+                ('documento', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'perfilsnapshot',
+            },
+        ),
+    ]
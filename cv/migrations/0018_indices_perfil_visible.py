@@ -0,0 +1,49 @@
+# Generated by Django 6.0.1 on 2026-10-18 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0017_perfilsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cursosrealizados',
+            index=models.Index(fields=['perfil', 'activarparaqueseveaenfront'], name='cursos_perfil_visible'),
+        ),
+        migrations.AddIndex(
+            model_name='datospersonales',
+            index=models.Index(fields=['perfilactivo', 'idperfil'], name='perfil_activo_idperfil'),
+        ),
+        migrations.AddIndex(
+            model_name='datospersonales',
+            index=models.Index(condition=models.Q(('perfilactivo', 1)), fields=['idperfil'], name='perfil_activo_parcial'),
+        ),
+        migrations.AddIndex(
+            model_name='experiencialaboral',
+            index=models.Index(fields=['perfil', 'activarparaqueseveaenfront'], name='experiencia_perfil_visible'),
+        ),
+        migrations.AddIndex(
+            model_name='productosacademicos',
+            index=models.Index(fields=['perfil', 'activarparaqueseveaenfront'], name='prodacad_perfil_visible'),
+        ),
+        migrations.AddIndex(
+            model_name='productoslaborales',
+            index=models.Index(fields=['perfil', 'activarparaqueseveaenfront'], name='prodlab_perfil_visible'),
+        ),
+        migrations.AddIndex(
+            model_name='reconocimientos',
+            index=models.Index(fields=['perfil', 'activarparaqueseveaenfront'], name='reconoc_perfil_visible'),
+        ),
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(fields=['perfil', 'activarparaqueseveaenfront', '-fecha_publicacion'], name='garage_perfil_visible_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['perfil', '-fecha_publicacion'], name='garage_visible_parcial'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-18 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0018_indices_perfil_visible'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ventagarage',
+            name='garage_visible_parcial',
+        ),
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['perfil', 'valordelbien'], name='garage_visible_precio'),
+        ),
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['perfil', '-fecha_publicacion', '-idventagarage'], name='garage_orden'),
+        ),
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['perfil', 'estadoproducto', '-fecha_publicacion', '-idventagarage'], name='garage_estado_orden'),
+        ),
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['perfil', 'condicion', '-fecha_publicacion', '-idventagarage'], name='garage_condicion_orden'),
+        ),
+    ]
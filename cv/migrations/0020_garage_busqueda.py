@@ -0,0 +1,86 @@
+from django.db import migrations
+
+
+# ✅ Índices de texto completo para VentaGarage (ver cv/search.py).
+# ✅ Viven fuera del modelo: cada motor tiene su propia estructura.
+# ✅ OJO (SQLite): si una migración futura reconstruye la tabla ventagarage,
+# ✅ los triggers se pierden; post_migrate los recrea (search.asegurar_indice_texto).
+
+PG_CREAR = [
+    """
+    ALTER TABLE ventagarage ADD COLUMN busqueda tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(nombreproducto, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX garage_busqueda_gin ON ventagarage USING GIN (busqueda)",
+]
+PG_BORRAR = [
+    "DROP INDEX IF EXISTS garage_busqueda_gin",
+    "ALTER TABLE ventagarage DROP COLUMN IF EXISTS busqueda",
+]
+
+SQLITE_CREAR = [
+    """
+    CREATE VIRTUAL TABLE ventagarage_fts USING fts5(
+        nombreproducto, descripcion,
+        content='ventagarage', content_rowid='idventagarage',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER ventagarage_fts_ai AFTER INSERT ON ventagarage BEGIN
+        INSERT INTO ventagarage_fts(rowid, nombreproducto, descripcion)
+        VALUES (new.idventagarage, new.nombreproducto, new.descripcion);
+    END
+    """,
+    """
+    CREATE TRIGGER ventagarage_fts_ad AFTER DELETE ON ventagarage BEGIN
+        INSERT INTO ventagarage_fts(ventagarage_fts, rowid, nombreproducto, descripcion)
+        VALUES ('delete', old.idventagarage, old.nombreproducto, old.descripcion);
+    END
+    """,
+    """
+    CREATE TRIGGER ventagarage_fts_au AFTER UPDATE OF nombreproducto, descripcion ON ventagarage BEGIN
+        INSERT INTO ventagarage_fts(ventagarage_fts, rowid, nombreproducto, descripcion)
+        VALUES ('delete', old.idventagarage, old.nombreproducto, old.descripcion);
+        INSERT INTO ventagarage_fts(rowid, nombreproducto, descripcion)
+        VALUES (new.idventagarage, new.nombreproducto, new.descripcion);
+    END
+    """,
+    # ✅ indexa lo que ya existía
+    "INSERT INTO ventagarage_fts(ventagarage_fts) VALUES ('rebuild')",
+]
+SQLITE_BORRAR = [
+    "DROP TRIGGER IF EXISTS ventagarage_fts_ai",
+    "DROP TRIGGER IF EXISTS ventagarage_fts_ad",
+    "DROP TRIGGER IF EXISTS ventagarage_fts_au",
+    "DROP TABLE IF EXISTS ventagarage_fts",
+]
+
+SQL = {
+    "postgresql": (PG_CREAR, PG_BORRAR),
+    "sqlite": (SQLITE_CREAR, SQLITE_BORRAR),
+}
+
+
+def crear(apps, schema_editor):
+    for sql in SQL.get(schema_editor.connection.vendor, ([], []))[0]:
+        schema_editor.execute(sql)
+
+
+def borrar(apps, schema_editor):
+    for sql in SQL.get(schema_editor.connection.vendor, ([], []))[1]:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0019_garage_paginacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear, borrar),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:40
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0020_garage_busqueda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubidaPendiente',
+            fields=[
+                ('idsubida', models.AutoField(primary_key=True, serialize=False)),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False)),
+                ('modelo', models.CharField(max_length=60)),
+                ('objeto_id', models.PositiveIntegerField()),
+                ('campo', models.CharField(max_length=60)),
+                ('nombre', models.CharField(max_length=200)),
+                ('contenido', models.BinaryField()),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('error', 'Error')], default='pendiente', max_length=20)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'subidapendiente',
+                'ordering': ['creado'],
+                'indexes': [models.Index(fields=['estado', 'creado'], name='subida_estado_creado')],
+                'constraints': [models.UniqueConstraint(fields=('modelo', 'objeto_id', 'campo'), name='subida_unica_por_campo')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cv', '0021_subidapendiente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subidapendiente',
+            name='proximo_intento',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
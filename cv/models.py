@@ -1,8 +1,13 @@
+import uuid
+
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from django.core.validators import RegexValidator, MinValueValidator
 from django.db.models import Q, F
+from django.db.models.fields.files import FieldFile
 
 # ✅ IMPORTANTE para Cloudinary (PDF = RAW)
 from cloudinary_storage.storage import MediaCloudinaryStorage, RawMediaCloudinaryStorage
@@ -41,14 +46,169 @@ def fecha_no_futura(value):
 
 # ===============================
 # ✅ MODELO BASE (OBLIGA VALIDACIÓN)
+# ✅ Recuerda lo leído de la BD: al editar solo se valida y se
+# ✅ escribe lo que cambió (update_fields automático).
 # ===============================
+_ARCHIVO_NUEVO = object()
+
+
+def _comparable(valor):
+    # ✅ un archivo se compara por nombre; uno recién subido siempre es un cambio
+    if isinstance(valor, FieldFile):
+        return valor.name if valor._committed else _ARCHIVO_NUEVO
+    if isinstance(valor, File):
+        return _ARCHIVO_NUEVO
+    return valor
+
+
 class ValidatedModel(models.Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._recordar_cargados()
+        return instance
+
+    def _recordar_cargados(self, campos=None):
+        # ✅ solo lo que está en memoria: los campos diferidos no se consultan
+        actual = {
+            f.attname: _comparable(self.__dict__[f.attname])
+            for f in self._meta.concrete_fields
+            if f.attname in self.__dict__ and (campos is None or f.attname in campos or f.name in campos)
+        }
+        # ✅ dict nuevo: copy.copy() de la instancia no comparte los cambios
+        self._cargado = actual if campos is None else {**getattr(self, "_cargado", {}), **actual}
+
+    def campos_cambiados(self):
+        """✅ Nombres de los campos que difieren de lo leído (todos si la fila es nueva)."""
+        cargado = getattr(self, "_cargado", None)
+        if self._state.adding or cargado is None:
+            return {f.name for f in self._meta.concrete_fields}
+        return {
+            f.name for f in self._meta.concrete_fields
+            if f.attname in self.__dict__
+            and (f.attname not in cargado or _comparable(self.__dict__[f.attname]) != cargado[f.attname])
+        }
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._recordar_cargados(kwargs.get("fields"))
+
     def save(self, *args, **kwargs):
-        self.full_clean()  # ✅ obliga validaciones
+        cambiados = self.campos_cambiados()
+        completo = (
+            self._state.adding
+            or kwargs.get("force_insert")
+            or self._meta.pk.name in cambiados
+            or not hasattr(self, "_cargado")
+        )
+
+        if completo:
+            self.full_clean()  # ✅ obliga validaciones
+        else:
+            if kwargs.get("update_fields") is None:
+                # ✅ vacío = nada que escribir: Django no hace ninguna consulta
+                kwargs["update_fields"] = cambiados
+            else:
+                cambiados = {self._meta.get_field(c).name for c in kwargs["update_fields"]}
+            if cambiados:
+                # ✅ clean() corre siempre (reglas entre campos, p. ej. fechas);
+                # ✅ lo que no cambió no repite validadores, unique ni constraints
+                self.full_clean(exclude=[
+                    f.name for f in self._meta.concrete_fields if f.name not in cambiados
+                ])
+
         super().save(*args, **kwargs)
+        # ✅ solo lo escrito queda "limpio": con update_fields parcial, los demás
+        # ✅ cambios en memoria siguen pendientes para el próximo save()
+        self._recordar_cargados(kwargs.get("update_fields"))
+
+    @classmethod
+    def validar_lote(cls, objs):
+        """
+        ✅ Valida muchas instancias de una vez -> {índice: {campo: [mensajes]}}.
+        ✅ Mismas reglas que full_clean(), pero las FKs y los campos únicos se
+        ✅ comprueban con UNA consulta IN por campo para todo el lote.
+        ✅ Las CheckConstraint quedan para la base de datos (clean() ya las cubre).
+        """
+        objs = list(objs)
+        errores = {}
+        fks = [f for f in cls._meta.concrete_fields if f.is_relation]
+
+        # ✅ validadores de cada campo + clean(), sin tocar la base de datos
+        for i, obj in enumerate(objs):
+            try:
+                obj.full_clean(exclude=[f.name for f in fks], validate_unique=False, validate_constraints=False)
+            except ValidationError as e:
+                errores[i] = e.message_dict
+
+        for f in fks:
+            _validar_fk_lote(f, objs, errores)
+        for f in cls._meta.concrete_fields:
+            if f.unique and not f.primary_key:
+                _validar_unico_lote(cls, f, objs, errores)
+        return errores
+
+
+def _agregar_error(errores, i, campo, mensajes):
+    errores.setdefault(i, {}).setdefault(campo, []).extend(str(m) for m in mensajes)
+
+
+def _validar_fk_lote(f, objs, errores):
+    pendientes = {}
+    for i, obj in enumerate(objs):
+        valor = getattr(obj, f.attname)
+        if valor in f.empty_values:
+            if not f.blank:
+                _agregar_error(errores, i, f.name, [f.error_messages["blank"]])
+            continue
+        try:
+            valor = f.target_field.to_python(valor)
+        except ValidationError as e:
+            _agregar_error(errores, i, f.name, e.messages)
+            continue
+        setattr(obj, f.attname, valor)
+        pendientes.setdefault(valor, []).append(i)
+
+    if not pendientes:
+        return
+    existentes = set(
+        f.related_model._base_manager
+        .filter(**{f"{f.target_field.attname}__in": list(pendientes)})
+        .values_list(f.target_field.attname, flat=True)
+    )
+    for valor, indices in pendientes.items():
+        if valor not in existentes:
+            for i in indices:
+                _agregar_error(errores, i, f.name, [f"No existe {f.related_model.__name__} con id {valor}."])
+
+
+def _validar_unico_lote(modelo, f, objs, errores):
+    por_valor = {}
+    for i, obj in enumerate(objs):
+        valor = getattr(obj, f.attname)
+        if valor is None or f.name in errores.get(i, {}):
+            continue
+        por_valor.setdefault(valor, []).append(i)
+
+    if not por_valor:
+        return
+    # ✅ valor -> pk de la fila que ya lo tiene (la misma fila no choca consigo misma)
+    existentes = dict(
+        modelo._default_manager
+        .filter(**{f"{f.attname}__in": list(por_valor)})
+        .values_list(f.attname, "pk")
+    )
+    for valor, indices in por_valor.items():
+        if valor in existentes:
+            choques = [i for i in indices if objs[i].pk is None or objs[i].pk != existentes[valor]]
+        else:
+            # ✅ nadie lo tiene aún: se lo queda el primero del lote
+            choques = indices[1:]
+        for i in choques:
+            _agregar_error(errores, i, f.name, objs[i].unique_error_message(modelo, (f.name,)).messages)
 
 
 # ===============================
@@ -119,6 +279,11 @@ class DatosPersonales(ValidatedModel):
 
     class Meta:
         db_table = "datospersonales"
+        indexes = [
+            models.Index(fields=["perfilactivo", "idperfil"], name="perfil_activo_idperfil"),
+            # ✅ parcial (PostgreSQL/SQLite): solo el perfil activo
+            models.Index(fields=["idperfil"], condition=Q(perfilactivo=1), name="perfil_activo_parcial"),
+        ]
 
     def __str__(self):
         return f"{self.nombres} {self.apellidos}"
@@ -177,6 +342,9 @@ class ExperienciaLaboral(ValidatedModel):
 
     class Meta:
         db_table = "experiencialaboral"
+        indexes = [
+            models.Index(fields=["perfil", "activarparaqueseveaenfront"], name="experiencia_perfil_visible"),
+        ]
         constraints = [
             models.CheckConstraint(
                 condition=Q(fechafingestion__isnull=True) | Q(fechafingestion__gte=F("fechainiciogestion")),
@@ -236,6 +404,9 @@ class CursosRealizados(ValidatedModel):
 
     class Meta:
         db_table = "cursosrealizados"
+        indexes = [
+            models.Index(fields=["perfil", "activarparaqueseveaenfront"], name="cursos_perfil_visible"),
+        ]
 
     def __str__(self):
         return self.nombrecurso
@@ -285,6 +456,9 @@ class Reconocimientos(ValidatedModel):
 
     class Meta:
         db_table = "reconocimientos"
+        indexes = [
+            models.Index(fields=["perfil", "activarparaqueseveaenfront"], name="reconoc_perfil_visible"),
+        ]
 
     def __str__(self):
         return f"{self.tiporeconocimiento} - {self.descripcionreconocimiento}"
@@ -318,6 +492,9 @@ class ProductosAcademicos(ValidatedModel):
 
     class Meta:
         db_table = "productosacademicos"
+        indexes = [
+            models.Index(fields=["perfil", "activarparaqueseveaenfront"], name="prodacad_perfil_visible"),
+        ]
 
     def __str__(self):
         return self.nombrerecurso
@@ -351,6 +528,9 @@ class ProductosLaborales(ValidatedModel):
 
     class Meta:
         db_table = "productoslaborales"
+        indexes = [
+            models.Index(fields=["perfil", "activarparaqueseveaenfront"], name="prodlab_perfil_visible"),
+        ]
 
     def __str__(self):
         return self.nombreproducto
@@ -424,6 +604,154 @@ class VentaGarage(ValidatedModel):
         ]
         # ✅ para que en consultas salga lo más nuevo primero
         ordering = ["-fecha_publicacion"]
+        indexes = [
+            models.Index(
+                fields=["perfil", "activarparaqueseveaenfront", "-fecha_publicacion"],
+                name="garage_perfil_visible_fecha"
+            ),
+            # ✅ filtro por rango de precio en /garage/
+            models.Index(
+                fields=["perfil", "valordelbien"],
+                condition=Q(activarparaqueseveaenfront=True),
+                name="garage_visible_precio"
+            ),
+            # ✅ orden de la paginación por cursor (fecha DESC, pk DESC),
+            # ✅ sin filtro y con cada filtro de igualdad de /garage/
+            models.Index(
+                fields=["perfil", "-fecha_publicacion", "-idventagarage"],
+                condition=Q(activarparaqueseveaenfront=True),
+                name="garage_orden"
+            ),
+            models.Index(
+                fields=["perfil", "estadoproducto", "-fecha_publicacion", "-idventagarage"],
+                condition=Q(activarparaqueseveaenfront=True),
+                name="garage_estado_orden"
+            ),
+            models.Index(
+                fields=["perfil", "condicion", "-fecha_publicacion", "-idventagarage"],
+                condition=Q(activarparaqueseveaenfront=True),
+                name="garage_condicion_orden"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.nombreproducto} - {self.estadoproducto} - {self.condicion}"
+
+
+# ===============================
+# ✅ TRABAJOS DE PDF (COLA EN LA BASE DE DATOS)
+# ===============================
+class TrabajoPDF(models.Model):
+    ESTADO_CHOICES = [
+        ("pendiente", "Pendiente"),
+        ("procesando", "Procesando"),
+        ("listo", "Listo"),
+        ("error", "Error"),
+    ]
+
+    idtrabajopdf = models.AutoField(primary_key=True)
+
+    # ✅ id público (no adivinable) para las URLs de estado/descarga
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+
+    perfil = models.ForeignKey(
+        DatosPersonales,
+        on_delete=models.CASCADE,
+        db_column="idperfilconqueestaactivo"
+    )
+
+    secciones = models.JSONField(default=list, blank=True)
+    certificados = models.JSONField(default=list, blank=True)
+
+    # ✅ reportlab / weasyprint
+    motor = models.CharField(max_length=20, default="reportlab")
+
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default="pendiente")
+    progreso = models.PositiveSmallIntegerField(default=0)
+
+    # ✅ clave del PDF generado dentro de la caché de disco
+    clave = models.CharField(max_length=80, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+
+    creado = models.DateTimeField(auto_now_add=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "trabajospdf"
+        ordering = ["creado"]
+        indexes = [
+            models.Index(fields=["estado", "creado"], name="trabajopdf_estado_creado"),
+        ]
+
+    def __str__(self):
+        return f"PDF {self.token} - {self.estado}"
+
+
+# ===============================
+# ✅ SNAPSHOT DEL PERFIL (LECTURA EN UNA SOLA CONSULTA)
+# ===============================
+class PerfilSnapshot(models.Model):
+    perfil = models.OneToOneField(
+        DatosPersonales,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="snapshot",
+        db_column="idperfil"
+    )
+
+    # ✅ perfil + secciones visibles + certificados ya ordenados
+    documento = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "perfilsnapshot"
+
+    def __str__(self):
+        return f"Snapshot perfil {self.perfil_id}"
+
+
+# ===============================
+# ✅ FOTOS PENDIENTES DE SUBIR (COLA EN LA BASE DE DATOS)
+# ✅ La foto ya normalizada espera aquí; el worker la sube al storage.
+# ===============================
+class SubidaPendiente(models.Model):
+    ESTADO_CHOICES = [
+        ("pendiente", "Pendiente"),
+        ("procesando", "Procesando"),
+        ("error", "Error"),
+    ]
+
+    idsubida = models.AutoField(primary_key=True)
+
+    # ✅ cambia si llega otra foto para el mismo campo antes de subir la anterior
+    token = models.UUIDField(default=uuid.uuid4, editable=False)
+
+    # ✅ destino: "cv.datospersonales" + pk + "fotoperfil"
+    modelo = models.CharField(max_length=60)
+    objeto_id = models.PositiveIntegerField()
+    campo = models.CharField(max_length=60)
+
+    nombre = models.CharField(max_length=200)
+    contenido = models.BinaryField()
+
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default="pendiente")
+    intentos = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    # ✅ tras un fallo no se reintenta antes de esto (espera exponencial)
+    proximo_intento = models.DateTimeField(default=timezone.now)
+
+    creado = models.DateTimeField(auto_now_add=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "subidapendiente"
+        ordering = ["creado"]
+        indexes = [
+            models.Index(fields=["estado", "creado"], name="subida_estado_creado"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["modelo", "objeto_id", "campo"], name="subida_unica_por_campo"),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo}#{self.objeto_id}.{self.campo} - {self.estado}"
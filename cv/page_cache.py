@@ -0,0 +1,56 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .versioning import site_version
+
+
+# ======================================================
+# ✅ CACHÉ DE PÁGINA COMPLETA (HTML YA RENDERIZADO)
+# ✅ La clave es la versión global: un cambio en cv.models
+# ✅ la deja huérfana y la siguiente visita vuelve a renderizar.
+# ======================================================
+def _cabeceras(response, etag, modificado):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(modificado)
+    # ✅ el navegador puede guardarla pero siempre revalida (304)
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def cache_pagina(nombre):
+    """✅ Decorador: sirve la página desde caché y responde 304 sin tocar la base."""
+
+    def decorador(view):
+        @wraps(view)
+        def _wrapped(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            version, modificado = site_version()
+            modificado = int(modificado)
+            etag = f'"{version}"'
+
+            no_modificada = get_conditional_response(request, etag=etag, last_modified=modificado)
+            if no_modificada is not None:
+                return _cabeceras(no_modificada, etag, modificado)
+
+            clave = f"cv:pagina:{nombre}:{version}"
+            guardada = cache.get(clave)
+            if guardada is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming:
+                    return response
+                guardada = (response.content, response["Content-Type"])
+                cache.set(clave, guardada, getattr(settings, "CV_PAGE_CACHE_TIMEOUT", 60 * 60 * 24))
+
+            contenido, content_type = guardada
+            return _cabeceras(HttpResponse(contenido, content_type=content_type), etag, modificado)
+
+        return _wrapped
+
+    return decorador
@@ -0,0 +1,68 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+# ======================================================
+# ✅ PAGINACIÓN POR CURSOR (KEYSET)
+# ✅ Orden: campo DESC (NULLs al final) + pk DESC como desempate.
+# ✅ La página N cuesta lo mismo que la primera: no hay OFFSET.
+# ======================================================
+def codificar_cursor(valor, pk):
+    datos = {"v": valor.isoformat() if valor is not None else None, "pk": pk}
+    return base64.urlsafe_b64encode(json.dumps(datos).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(texto):
+    """✅ (valor, pk) o None si el cursor no es válido."""
+    if not texto:
+        return None
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4)))
+        valor = parse_datetime(datos["v"]) if datos["v"] is not None else None
+        if datos["v"] is not None and valor is None:
+            return None
+        return valor, int(datos["pk"])
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def tramos_keyset(qs, campo, cursor):
+    """
+    ✅ Consultas a recorrer en orden: primero los valores no nulos y luego la
+    ✅ cola de NULLs. Separarlas deja un rango simple (campo <= valor) que el
+    ✅ índice puede saltar directo, sin recorrer lo de páginas anteriores.
+    """
+    no_nulos = qs.filter(**{f"{campo}__isnull": False}).order_by(f"-{campo}", "-pk")
+    nulos = qs.filter(**{f"{campo}__isnull": True}).order_by("-pk")
+
+    posicion = decodificar_cursor(cursor)
+    if posicion is None:
+        return [no_nulos, nulos]
+
+    valor, pk = posicion
+    if valor is None:
+        # ✅ ya estamos en la cola de NULLs: solo queda desempatar por pk
+        return [nulos.filter(pk__lt=pk)]
+    no_nulos = no_nulos.filter(Q(**{f"{campo}__lt": valor}) | Q(pk__lt=pk), **{f"{campo}__lte": valor})
+    return [no_nulos, nulos]
+
+
+def pagina_keyset(qs, campo, cursor, tamano):
+    """✅ Devuelve (filas, cursor_siguiente); cursor_siguiente es None en la última página."""
+    # ✅ una fila de más dice si hay otra página sin hacer COUNT;
+    # ✅ el segundo tramo solo se consulta si el primero no llenó la página
+    filas = []
+    for tramo in tramos_keyset(qs, campo, cursor):
+        filas += list(tramo[:tamano + 1 - len(filas)])
+        if len(filas) > tamano:
+            break
+
+    siguiente = None
+    if len(filas) > tamano:
+        filas = filas[:tamano]
+        ultima = filas[-1]
+        siguiente = codificar_cursor(getattr(ultima, campo), ultima.pk)
+    return filas, siguiente
@@ -0,0 +1,393 @@
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+
+import shutil
+import tempfile
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+
+from .anexos import resolver_anexos
+from .images import preparar_imagen
+from .media import prefetch
+from .loaders import completar
+from .text_layout import layout_text, wrap_text
+
+
+def es_imagen(url):
+    return url.lower().endswith((".png", ".jpg", ".jpeg", ".webp"))
+
+
+def es_pdf(url):
+    return url.lower().endswith(".pdf")
+
+
+def descargas_completas(origenes, descargas):
+    """✅ False si algún archivo pedido no se pudo bajar (el PDF no debe cachearse)."""
+    return all(data is not None for origen, data in zip(origenes, descargas) if origen)
+
+
+def leer_pdf(data):
+    """✅ PdfReader del certificado, o None si no es un PDF válido."""
+    if not data:
+        return None
+    try:
+        reader = PdfReader(BytesIO(data))
+        if len(reader.pages) == 0:
+            return None
+        return reader
+    except Exception:
+        return None
+
+
+def unir_anexos_pdf(base, inserciones, output):
+    """
+    ✅ Copia las páginas originales de cada certificado PDF justo
+    ✅ después de su portada (sin rasterizar: quedan livianas).
+    """
+    writer = PdfWriter()
+    for i, page in enumerate(PdfReader(base).pages):
+        writer.add_page(page)
+        for reader in inserciones.get(i, []):
+            for page_cert in reader.pages:
+                writer.add_page(page_cert)
+    writer.write(output)
+
+
+# ======================================================
+# ✅ PDF (REPORTLAB) + ANEXOS CERTIFICADOS
+# ======================================================
+def render_cv_pdf(output, perfil, secciones, certificados_tokens, progreso=None):
+    """
+    ✅ Dibuja la hoja de vida en `output` (cualquier objeto con write).
+    ✅ `progreso(pct)` opcional: lo usan los trabajos en segundo plano.
+    ✅ Devuelve False si faltó alguna imagen por un error de descarga.
+    """
+    def avisar(pct):
+        if progreso:
+            progreso(int(pct))
+
+    # ✅ solo se cargan las secciones pedidas (una consulta por sección)
+    completar(perfil, "pdf", secciones)
+    experiencia = getattr(perfil, "experiencia", [])
+    cursos = getattr(perfil, "cursos", [])
+    reconocimientos_cv = getattr(perfil, "reconocimientos_cv", [])
+    productos_academicos = getattr(perfil, "productos_academicos", [])
+    productos_laborales = getattr(perfil, "productos_laborales", [])
+
+    # ======================================================
+    # ✅ ANEXOS: SE RESUELVEN ANTES DE DIBUJAR
+    # ======================================================
+    anexos = resolver_anexos(perfil, certificados_tokens)
+    avisar(10)
+
+    # ======================================================
+    # ✅ DESCARGA EN PARALELO (FOTO + ANEXOS) ANTES DE DIBUJAR
+    # ✅ Pasa por la caché local de media
+    # ======================================================
+    foto = perfil.fotoperfil if perfil and getattr(perfil, "fotoperfil", None) else None
+
+    origenes = [foto] + [a["archivo"] if es_imagen(a["url"]) or es_pdf(a["url"]) else None for a in anexos]
+    descargas = prefetch(origenes)
+    foto_bytes = descargas[0]
+    anexos_bytes = descargas[1:]
+    avisar(40)
+
+    # ✅ si hay certificados en PDF, ReportLab escribe a un temporal
+    # ✅ y al final se intercalan las páginas originales
+    inserciones = {}
+    destino = output
+    if any(es_pdf(a["url"]) for a in anexos):
+        destino = tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024)
+
+    p = canvas.Canvas(destino, pagesize=letter)
+    width, height = letter
+
+    x_left = 2 * cm
+    x_right = width - 2 * cm
+    y = height - 2 * cm
+
+    # ======================================================
+    # ✅ FUNCIONES PDF
+    # ======================================================
+    def draw_image_bytes(image_bytes, x, y_pos, w, h):
+        if not image_bytes:
+            return False
+        try:
+            image_file = BytesIO(image_bytes)
+            img = ImageReader(image_file)
+            p.drawImage(img, x, y_pos, width=w, height=h, mask="auto")
+            return True
+        except:
+            return False
+
+    def nueva_pagina_si_es_necesario(min_y=3 * cm):
+        nonlocal y
+        if y < min_y:
+            p.showPage()
+            y = height - 2 * cm
+
+    def draw_section_title(text):
+        nonlocal y
+        nueva_pagina_si_es_necesario()
+        y -= 0.15 * cm
+        p.setFillColor(colors.HexColor("#1f2937"))
+        p.setFont("Helvetica-Bold", 12)
+        p.drawString(x_left, y, text.upper())
+        y -= 0.55 * cm
+        if text.lower() != "datos personales":
+            p.setStrokeColor(colors.HexColor("#1f2937"))
+            p.setLineWidth(1)
+            p.line(x_left, y, x_right, y)
+        y -= 0.45 * cm
+
+    def draw_wrapped_text(text, font="Helvetica", size=10, leading=16, max_width=None):
+        nonlocal y
+        if not text:
+            return
+        if max_width is None:
+            max_width = x_right - x_left
+
+        p.setFont(font, size)
+        p.setFillColor(colors.black)
+
+        for line in wrap_text(text, font, size, max_width):
+            nueva_pagina_si_es_necesario()
+            p.drawString(x_left, y, line)
+            y -= leading
+
+        y -= 4
+
+    def draw_card(title, subtitle=None, body=None):
+        nonlocal y
+        nueva_pagina_si_es_necesario()
+
+        padding = 12
+        leading = 12
+        text_width = (x_right - x_left - 2 * padding)
+
+        # ✅ el cuerpo se parte una sola vez: sirve para medir y para dibujar
+        parrafo = layout_text(body, font="Helvetica", size=9, leading=leading, max_width=text_width)
+
+        card_height = 10 + 16
+        if subtitle:
+            card_height += 13
+        if body:
+            card_height += parrafo.alto
+        card_height += 14
+
+        p.setFillColor(colors.HexColor("#F3F4F6"))
+        p.setStrokeColor(colors.HexColor("#D1D5DB"))
+        p.roundRect(
+            x_left, y - card_height,
+            x_right - x_left, card_height,
+            10, fill=1, stroke=1
+        )
+
+        text_y = y - 20
+
+        p.setFillColor(colors.HexColor("#111827"))
+        p.setFont("Helvetica-Bold", 11)
+        p.drawString(x_left + padding, text_y, str(title))
+        text_y -= 14
+
+        if subtitle:
+            p.setFillColor(colors.HexColor("#374151"))
+            p.setFont("Helvetica", 9)
+            p.drawString(x_left + padding, text_y, str(subtitle))
+            text_y -= 12
+
+        if body:
+            p.setFillColor(colors.black)
+            parrafo.dibujar(p, x_left + padding, text_y)
+
+        y -= (card_height + 14)
+
+    # ======================================================
+    # ✅ ENCABEZADO
+    # ======================================================
+    if not perfil:
+        p.setFont("Helvetica-Bold", 14)
+        p.drawString(x_left, y, "No existe un perfil activo.")
+        p.save()
+        return
+
+    foto_size = 3.6 * cm
+    foto_x = x_right - foto_size - 0.6 * cm
+    foto_y = height - 5.0 * cm
+
+    draw_image_bytes(preparar_imagen(foto_bytes, foto_size, foto_size), foto_x, foto_y, foto_size, foto_size)
+
+    p.setFillColor(colors.HexColor("#111827"))
+    p.setFont("Helvetica-Bold", 18)
+    p.drawString(x_left, y, f"{perfil.nombres} {perfil.apellidos}")
+    y -= 22
+
+    p.setFillColor(colors.HexColor("#4b5563"))
+    p.setFont("Helvetica", 11)
+    p.drawString(x_left, y, perfil.descripcionperfil)
+    y -= 25
+
+    # ======================================================
+    # ✅ ORDEN FIJO DEL PDF (como tu hoja de vida)
+    # ======================================================
+    if "datos" in secciones:
+        draw_section_title("Datos personales")
+        draw_wrapped_text(f"Cédula: {perfil.numerocedula}", size=10)
+        draw_wrapped_text(f"Nacionalidad: {perfil.nacionalidad}", size=10)
+        draw_wrapped_text(f"Dirección: {perfil.direcciondomiciliaria}", size=10)
+
+    if "experiencia" in secciones:
+        draw_section_title("Experiencia laboral")
+        if experiencia:
+            for e in experiencia:
+                draw_card(
+                    title=f"{e.cargodesempenado} - {e.nombrempresa}",
+                    subtitle=e.lugarempresa,
+                    body=e.descripcionfunciones
+                )
+        else:
+            draw_card("No hay experiencia registrada.")
+
+    if "cursos" in secciones:
+        draw_section_title("Cursos realizados")
+        if cursos:
+            for c in cursos:
+                draw_card(
+                    title=f"{c.nombrecurso} ({c.totalhoras} horas)",
+                    subtitle=f"{c.fechainicio} - {c.fechafin}",
+                    body=c.descripcioncurso
+                )
+        else:
+            draw_card("No hay cursos registrados.")
+
+    if "reconocimientos" in secciones:
+        draw_section_title("Reconocimientos")
+        if reconocimientos_cv:
+            for r in reconocimientos_cv:
+                draw_card(
+                    title=f"{r.tiporeconocimiento}: {r.descripcionreconocimiento}",
+                    subtitle=r.entidadpatrocinadora,
+                    body=""
+                )
+        else:
+            draw_card("No hay reconocimientos registrados.")
+
+    if "prod_academicos" in secciones:
+        draw_section_title("Productos académicos")
+        if productos_academicos:
+            for pa in productos_academicos:
+                draw_card(
+                    title=pa.nombrerecurso,
+                    subtitle=pa.clasificador,
+                    body=pa.descripcion
+                )
+        else:
+            draw_card("No hay productos académicos registrados.")
+
+    if "prod_laborales" in secciones:
+        draw_section_title("Productos laborales")
+        if productos_laborales:
+            for pl in productos_laborales:
+                draw_card(
+                    title=pl.nombreproducto,
+                    subtitle=str(pl.fechaproducto),
+                    body=pl.descripcion
+                )
+        else:
+            draw_card("No hay productos laborales registrados.")
+
+    avisar(60)
+
+    # ======================================================
+    # ✅ ANEXOS: CADA CERTIFICADO SELECCIONADO EN HOJA NUEVA
+    # ======================================================
+    if anexos:
+        contador = 1
+
+        for anexo, image_bytes in zip(anexos, anexos_bytes):
+            nombre = anexo["nombre"]
+            url_cert = anexo["url"]
+
+            p.showPage()
+
+            p.setFillColor(colors.HexColor("#111827"))
+            p.setFont("Helvetica-Bold", 14)
+            p.drawString(x_left, height - 2 * cm, f"ANEXO {contador}: CERTIFICADO")
+
+            p.setFillColor(colors.HexColor("#4b5563"))
+            p.setFont("Helvetica", 10)
+            p.drawString(x_left, height - 2.7 * cm, nombre)
+
+            y_temp = height - 4.0 * cm
+
+            try:
+                # ✅ Imágenes: se dibujan en la hoja del anexo
+                if es_imagen(url_cert):
+                    if not image_bytes:
+                        raise ValueError("No se pudo descargar el certificado.")
+
+                    max_w = width - (4 * cm)
+                    max_h = height - (6 * cm)
+
+                    # ✅ reducida a la resolución de impresión de la caja
+                    image_file = BytesIO(preparar_imagen(image_bytes, max_w, max_h))
+                    img = ImageReader(image_file)
+
+                    img_w, img_h = img.getSize()
+
+                    scale = min(max_w / img_w, max_h / img_h)
+                    new_w = img_w * scale
+                    new_h = img_h * scale
+
+                    x_img = (width - new_w) / 2
+                    y_img = (height - new_h) / 2 - 0.8 * cm
+
+                    p.drawImage(img, x_img, y_img, width=new_w, height=new_h, mask="auto")
+
+                elif es_pdf(url_cert):
+                    reader = leer_pdf(image_bytes)
+                    if reader is None:
+                        raise ValueError("Certificado PDF inválido o no disponible.")
+
+                    # ✅ esta hoja queda como portada; detrás van las páginas originales
+                    p.setFillColor(colors.black)
+                    p.setFont("Helvetica", 10)
+                    paginas = len(reader.pages)
+                    p.drawString(
+                        x_left, y_temp,
+                        f"Documento original adjunto en {paginas} página(s) a continuación."
+                    )
+                    inserciones.setdefault(p.getPageNumber() - 1, []).append(reader)
+
+                else:
+                    p.setFillColor(colors.red)
+                    p.setFont("Helvetica-Bold", 11)
+                    p.drawString(x_left, y_temp, "⚠️ Formato de certificado no soportado.")
+                    p.setFillColor(colors.black)
+                    p.setFont("Helvetica", 10)
+                    p.drawString(x_left, y_temp - 18, "Sube el certificado como PDF, PNG o JPG.")
+
+            except:
+                p.setFillColor(colors.red)
+                p.setFont("Helvetica-Bold", 11)
+                p.drawString(x_left, y_temp, "❌ Error al cargar el certificado.")
+
+            contador += 1
+            avisar(60 + 35 * (contador - 1) / len(anexos))
+
+    p.save()
+
+    if destino is not output:
+        destino.seek(0)
+        if inserciones:
+            unir_anexos_pdf(destino, inserciones, output)
+        else:
+            shutil.copyfileobj(destino, output)
+        destino.close()
+
+    avisar(100)
+    return descargas_completas(origenes, descargas)
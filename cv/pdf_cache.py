@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.http import (
+    FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+)
+from django.utils.http import parse_etags, quote_etag
+
+from .anexos import parse_tokens
+from .disk_cache import evict, tocar
+from .versioning import data_version
+
+
+# ======================================================
+# ✅ SECCIONES QUE EL PDF SABE DIBUJAR
+# ======================================================
+SECCIONES_PDF = (
+    "datos", "experiencia", "cursos", "reconocimientos",
+    "prod_academicos", "prod_laborales",
+)
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _cache_dir():
+    ruta = Path(getattr(settings, "CV_PDF_CACHE_DIR", Path(settings.BASE_DIR) / ".cache" / "pdf"))
+    ruta.mkdir(parents=True, exist_ok=True)
+    return ruta
+
+
+def _max_bytes():
+    return getattr(settings, "CV_PDF_CACHE_MAX_BYTES", 200 * 1024 * 1024)
+
+
+def _spool_bytes():
+    return getattr(settings, "CV_PDF_SPOOL_MAX_BYTES", 2 * 1024 * 1024)
+
+
+def _chunk_bytes():
+    return getattr(settings, "CV_PDF_STREAM_CHUNK_BYTES", 64 * 1024)
+
+
+# ======================================================
+# ✅ NORMALIZACIÓN DE PARÁMETROS
+# ======================================================
+def normalizar_secciones(secciones):
+    """✅ El orden del PDF es fijo, así que solo importa el conjunto."""
+    return sorted({str(s).strip() for s in secciones} & set(SECCIONES_PDF))
+
+
+def normalizar_tokens(tokens):
+    """✅ Sin inválidos ni repetidos; el orden sí importa (numera los anexos)."""
+    return [f"{tipo}-{idx}" for tipo, idx in parse_tokens(tokens)]
+
+
+def cache_key(perfil, secciones, tokens, motor="reportlab"):
+    payload = json.dumps({
+        "perfil": perfil.pk,
+        "version": data_version(perfil.pk),
+        "secciones": secciones,
+        "certificados": tokens,
+        "motor": motor,
+    }, sort_keys=True)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:40]
+    # ✅ el prefijo con el id permite invalidar por perfil
+    return f"{perfil.pk}-{digest}"
+
+
+# ======================================================
+# ✅ ALMACÉN EN DISCO (LRU POR FECHA DE ACCESO)
+# ======================================================
+def _ruta(clave):
+    return _cache_dir() / f"{clave}.pdf"
+
+
+def abrir(clave):
+    """✅ Devuelve el PDF cacheado abierto, o None si no existe."""
+    try:
+        ruta = _ruta(clave)
+        archivo = open(ruta, "rb")
+    except OSError:
+        # ✅ no está, o no hay carpeta de caché utilizable
+        return None
+    tocar(ruta)
+    return archivo
+
+
+def _linearizar(origen, carpeta):
+    """
+    ✅ "Fast web view": el navegador muestra la página 1 antes de bajar el resto.
+    ✅ Necesita `qpdf`; si no está instalado se deja el PDF tal cual.
+    """
+    if not getattr(settings, "CV_PDF_LINEARIZE", False):
+        return origen
+    qpdf = shutil.which("qpdf")
+    if not qpdf:
+        return origen
+
+    fd, destino = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+    os.close(fd)
+    try:
+        resultado = subprocess.run(
+            [qpdf, "--linearize", origen, destino],
+            capture_output=True, timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError):
+        resultado = None
+    # ✅ qpdf devuelve 3 cuando solo hubo advertencias
+    if resultado is None or resultado.returncode not in (0, 3):
+        os.unlink(destino)
+        return origen
+    os.unlink(origen)
+    return destino
+
+
+def _sin_cache(tmp):
+    # ✅ se sirve una vez y desaparece al cerrarlo
+    archivo = open(tmp, "rb")
+    os.unlink(tmp)
+    return archivo
+
+
+def generar(clave, render, clave_parcial=None):
+    """
+    ✅ `render(f)` escribe el PDF directo a un temporal en disco
+    ✅ (nada de copias en memoria); luego se publica de forma atómica.
+    ✅ Si `render` devuelve False (faltó una imagen por un fallo de descarga)
+    ✅ no se publica bajo `clave`: va a `clave_parcial` o queda sin cachear.
+    ✅ Devuelve (archivo abierto, clave en la caché o None).
+    ✅ Los errores de `render` se propagan: nunca se dibuja dos veces.
+    """
+    try:
+        carpeta = _cache_dir()
+        fd, tmp = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+    except OSError:
+        # ✅ sin disco para la caché: temporal que pasa a disco si crece
+        archivo = tempfile.SpooledTemporaryFile(max_size=_spool_bytes())
+        render(archivo)
+        archivo.seek(0)
+        return archivo, None
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            completo = render(f) is not False
+        tmp = _linearizar(tmp, carpeta)
+        publicada = clave if completo else clave_parcial
+        if publicada is None:
+            return _sin_cache(tmp), None
+        try:
+            os.replace(tmp, _ruta(publicada))
+        except OSError:
+            # ✅ no se pudo publicar: el PDF ya está hecho, se sirve igual
+            return _sin_cache(tmp), None
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _evict(conservar=publicada)
+    return abrir(publicada), publicada
+
+
+def obtener_o_generar(clave, render):
+    """✅ PDF abierto desde la caché; si no está, se genera (y se guarda si salió completo)."""
+    archivo = abrir(clave)
+    if archivo is not None:
+        return archivo
+    archivo, _ = generar(clave, render)
+    return archivo
+
+
+def _evict(conservar=None):
+    # ✅ los menos usados primero
+    evict(_cache_dir(), "*.pdf", _max_bytes(), conservar=conservar)
+
+
+def invalidar_perfil(perfil_id):
+    for ruta in _cache_dir().glob(f"{perfil_id}-*.pdf"):
+        try:
+            ruta.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# ======================================================
+# ✅ RESPUESTA CON ETAG + GET CONDICIONAL + RANGE
+# ======================================================
+def _parse_range(header, size):
+    m = RANGE_RE.match(header.strip())
+    if not m:
+        return None
+    inicio, fin = m.groups()
+    if inicio == "" and fin == "":
+        return None
+    if inicio == "":
+        # ✅ bytes=-N -> últimos N bytes
+        largo = int(fin)
+        if largo == 0:
+            return None
+        return max(size - largo, 0), size - 1
+    inicio = int(inicio)
+    fin = int(fin) if fin else size - 1
+    if inicio > fin or inicio >= size:
+        return None
+    return inicio, min(fin, size - 1)
+
+
+def _iter_rango(archivo, inicio, largo):
+    try:
+        archivo.seek(inicio)
+        chunk = _chunk_bytes()
+        while largo > 0:
+            data = archivo.read(min(chunk, largo))
+            if not data:
+                break
+            largo -= len(data)
+            yield data
+    finally:
+        archivo.close()
+
+
+def no_modificado(request, clave):
+    """
+    ✅ 304 si el cliente ya tiene esta clave (If-None-Match), o None.
+    ✅ La clave se conoce antes de generar: no hace falta abrir ni dibujar nada.
+    """
+    etag = quote_etag(clave)
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        if "*" in etags or etag in etags:
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+    return None
+
+
+def servir_pdf(request, archivo, clave, filename="hoja_vida.pdf"):
+    etag = quote_etag(clave)
+
+    response = no_modificado(request, clave)
+    if response is not None:
+        archivo.close()
+        return response
+
+    size = archivo.seek(0, os.SEEK_END)
+    archivo.seek(0)
+    rango = request.META.get("HTTP_RANGE")
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if rango and (not if_range or if_range.strip() == etag):
+        limites = _parse_range(rango, size)
+        if limites is None:
+            archivo.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        inicio, fin = limites
+        response = StreamingHttpResponse(
+            _iter_rango(archivo, inicio, fin - inicio + 1),
+            status=206, content_type="application/pdf",
+        )
+        response["Content-Range"] = f"bytes {inicio}-{fin}/{size}"
+        response["Content-Length"] = str(fin - inicio + 1)
+    else:
+        # ✅ se envía por bloques desde disco, nunca el PDF entero en memoria
+        response = FileResponse(archivo, content_type="application/pdf")
+        response.block_size = _chunk_bytes()
+        response["Content-Length"] = str(size)
+
+    response["Content-Disposition"] = f'inline; filename="{filename}"'
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
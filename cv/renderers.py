@@ -0,0 +1,162 @@
+import base64
+import shutil
+import tempfile
+from functools import lru_cache
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .anexos import resolver_anexos
+from .images import preparar_imagen
+from .loaders import SECCION_A_ATRIBUTO, completar
+from .media import prefetch
+from .pdf import descargas_completas, es_imagen, es_pdf, leer_pdf, render_cv_pdf, unir_anexos_pdf
+
+
+# ======================================================
+# ✅ MOTOR 1: REPORTLAB (DIBUJO A MANO, EL DE SIEMPRE)
+# ✅ render() devuelve False si faltó alguna imagen (ver pdf_cache.generar)
+# ======================================================
+class ReportLabRenderer:
+    nombre = "reportlab"
+
+    def disponible(self):
+        return True
+
+    def render(self, output, perfil, secciones, certificados_tokens, progreso=None):
+        return render_cv_pdf(output, perfil, secciones, certificados_tokens, progreso=progreso)
+
+
+# ======================================================
+# ✅ MOTOR 2: WEASYPRINT (HTML + CSS -> cv/pdf.html)
+# ======================================================
+@lru_cache(maxsize=1)
+def _weasyprint():
+    """✅ Import perezoso: WeasyPrint necesita Pango instalado en el sistema."""
+    import weasyprint
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    css = weasyprint.CSS(string=render_to_string("cv/pdf.css"), font_config=font_config)
+    # ✅ fuentes y hoja de estilos se reutilizan en todo el proceso
+    return weasyprint, font_config, css
+
+
+@lru_cache(maxsize=1)
+def _weasyprint_disponible():
+    # ✅ se intenta una vez por proceso: sin Pango el import lanza OSError
+    try:
+        _weasyprint()
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+def _data_uri(data):
+    return "data:image/jpeg;base64," + base64.b64encode(data).decode("ascii")
+
+
+class WeasyPrintRenderer:
+    nombre = "weasyprint"
+
+    # ✅ tamaño de las cajas en puntos (carta con márgenes de 2 cm)
+    FOTO_PT = 68
+    ANEXO_W_PT = 500
+    ANEXO_H_PT = 567
+
+    def disponible(self):
+        return _weasyprint_disponible()
+
+    def render(self, output, perfil, secciones, certificados_tokens, progreso=None):
+        def avisar(pct):
+            if progreso:
+                progreso(int(pct))
+
+        weasyprint, font_config, css = _weasyprint()
+
+        completar(perfil, "pdf", secciones)
+        contexto = {"perfil": perfil, "secciones": secciones, "anexos": []}
+        for atributo in SECCION_A_ATRIBUTO.values():
+            contexto[atributo] = getattr(perfil, atributo, [])
+        contexto["reconocimientos"] = contexto.pop("reconocimientos_cv")
+
+        anexos = resolver_anexos(perfil, certificados_tokens)
+        avisar(10)
+
+        # ✅ misma descarga en paralelo que ReportLab; WeasyPrint no toca la red
+        foto = perfil.fotoperfil if perfil and getattr(perfil, "fotoperfil", None) else None
+        origenes = [foto] + [a["archivo"] if es_imagen(a["url"]) or es_pdf(a["url"]) else None for a in anexos]
+        descargas = prefetch(origenes)
+        completo = descargas_completas(origenes, descargas)
+        avisar(40)
+
+        if descargas[0]:
+            contexto["foto_src"] = _data_uri(preparar_imagen(descargas[0], self.FOTO_PT, self.FOTO_PT))
+
+        lectores = {}
+        for n, (anexo, data) in enumerate(zip(anexos, descargas[1:]), start=1):
+            item = {"nombre": anexo["nombre"], "src": None, "paginas": 0}
+            if data and es_imagen(anexo["url"]):
+                item["src"] = _data_uri(preparar_imagen(data, self.ANEXO_W_PT, self.ANEXO_H_PT))
+            elif es_pdf(anexo["url"]):
+                reader = leer_pdf(data)
+                if reader is not None:
+                    item["paginas"] = len(reader.pages)
+                    lectores[f"anexo-{n}"] = reader
+            contexto["anexos"].append(item)
+
+        html = render_to_string("cv/pdf.html", contexto)
+        documento = weasyprint.HTML(string=html, base_url=str(settings.BASE_DIR)).render(
+            stylesheets=[css], font_config=font_config
+        )
+        avisar(80)
+
+        if not lectores:
+            documento.write_pdf(output)
+            avisar(100)
+            return completo
+
+        # ✅ la portada de cada anexo PDF se ubica por su ancla
+        inserciones = {}
+        for i, page in enumerate(documento.pages):
+            for ancla in page.anchors:
+                if ancla in lectores:
+                    inserciones.setdefault(i, []).append(lectores[ancla])
+
+        with tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024) as base:
+            documento.write_pdf(base)
+            base.seek(0)
+            if inserciones:
+                unir_anexos_pdf(base, inserciones, output)
+            else:
+                shutil.copyfileobj(base, output)
+        avisar(100)
+        return completo
+
+
+# ======================================================
+# ✅ SELECCIÓN DEL MOTOR (SETTING O ?engine=)
+# ======================================================
+RENDERERS = {
+    ReportLabRenderer.nombre: ReportLabRenderer(),
+    WeasyPrintRenderer.nombre: WeasyPrintRenderer(),
+}
+
+
+def _usable(nombre):
+    return nombre in RENDERERS and RENDERERS[nombre].disponible()
+
+
+def nombre_motor(solicitado=None):
+    """
+    ✅ Motor pedido si existe y se puede cargar; si no, el de settings;
+    ✅ y si tampoco, ReportLab (siempre disponible).
+    """
+    if _usable(solicitado):
+        return solicitado
+    por_defecto = getattr(settings, "CV_PDF_ENGINE", ReportLabRenderer.nombre)
+    return por_defecto if _usable(por_defecto) else ReportLabRenderer.nombre
+
+
+def get_renderer(nombre=None):
+    return RENDERERS[nombre_motor(nombre)]
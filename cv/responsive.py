@@ -0,0 +1,89 @@
+import cloudinary
+from cloudinary_storage.storage import MediaCloudinaryStorage
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+from PIL import features
+
+
+# ======================================================
+# ✅ IMÁGENES RESPONSIVAS (MINIATURAS POR ANCHO)
+# ✅ Cloudinary -> URL con transformación (la genera su CDN)
+# ✅ Local      -> /img/<token>/ la genera Pillow y la guarda en disco
+# ✅ Cualquier otro storage -> la URL original, sin derivadas
+# ======================================================
+SALT = "cv.imagenes.derivada"
+
+# ✅ del más liviano al de mayor compatibilidad (el último va en <img>)
+FORMATOS = ("avif", "webp", "jpg")
+MIME = {"avif": "image/avif", "webp": "image/webp", "jpg": "image/jpeg"}
+
+
+def anchos():
+    return tuple(sorted(getattr(settings, "CV_IMAGE_WIDTHS", (160, 320, 480, 640, 960, 1280))))
+
+
+def formatos():
+    # ✅ en local, solo lo que el Pillow instalado sabe escribir
+    return tuple(f for f in FORMATOS if f == "jpg" or features.check(f))
+
+
+def _campo_de(archivo):
+    campo = archivo.field
+    return f"{campo.model._meta.label_lower}.{campo.name}"
+
+
+def _url_cloudinary(archivo, ancho, formato):
+    nombre = archivo.storage._prepend_prefix(archivo.name)
+    recurso = cloudinary.CloudinaryResource(nombre, default_resource_type="image")
+    # ✅ c_limit: nunca agranda; q_auto: Cloudinary elige la calidad
+    return recurso.build_url(transformation=[{
+        "width": ancho, "crop": "limit", "quality": "auto", "fetch_format": formato,
+    }])
+
+
+def _url_local(archivo, ancho, formato):
+    token = signing.dumps({"c": _campo_de(archivo), "n": archivo.name, "w": ancho, "f": formato}, salt=SALT)
+    return reverse("imagen_derivada", args=[token])
+
+
+def leer_token(token):
+    """✅ (campo, nombre, ancho, formato) o None si la firma no es válida."""
+    try:
+        datos = signing.loads(token, salt=SALT)
+        return datos["c"], datos["n"], int(datos["w"]), datos["f"]
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+def _generador(archivo):
+    if isinstance(archivo.storage, MediaCloudinaryStorage):
+        return _url_cloudinary
+    if isinstance(archivo.storage, FileSystemStorage):
+        return _url_local
+    return None
+
+
+def fuentes(archivo, max_ancho=None):
+    """
+    ✅ Lista de {"tipo", "srcset", "src"} lista para <picture>, en el orden de
+    ✅ FORMATOS ("src" = el ancho mayor). Vacía si el storage no permite derivadas.
+    """
+    if not archivo:
+        return []
+    generar = _generador(archivo)
+    if generar is None:
+        return []
+
+    lista = [a for a in anchos() if max_ancho is None or a <= max_ancho] or [anchos()[0]]
+    disponibles = FORMATOS if generar is _url_cloudinary else formatos()
+    resultado = []
+    for formato in disponibles:
+        urls = [(generar(archivo, a, formato), a) for a in lista]
+        resultado.append({
+            "tipo": MIME[formato],
+            "srcset": ", ".join(f"{url} {a}w" for url, a in urls),
+            "src": urls[-1][0],
+        })
+    return resultado
@@ -0,0 +1,168 @@
+import re
+import sys
+from decimal import Decimal, InvalidOperation
+
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import VentaGarage
+
+
+# ======================================================
+# ✅ BÚSQUEDA DE TEXTO EN EL GARAGE (nombreproducto + descripcion)
+# ✅ PostgreSQL -> columna tsvector generada + índice GIN
+# ✅ SQLite     -> tabla FTS5 sincronizada por triggers
+# ✅ (ambas las crea la migración 0020; se mantienen solas en cada escritura)
+# ======================================================
+CONFIG_PG = "spanish"
+
+
+# ======================================================
+# ✅ TRIGGERS FTS5: SE REVISAN DESPUÉS DE CADA migrate (ver apps.py)
+# ✅ SQLite rehace la tabla en AlterField/RemoveField y los triggers
+# ✅ desaparecen sin error; aquí se recrean si falta alguno.
+# ======================================================
+MIGRACION_FTS = ("cv", "0020_garage_busqueda")
+
+SQLITE_FTS = {
+    "ventagarage_fts": """
+        CREATE VIRTUAL TABLE IF NOT EXISTS ventagarage_fts USING fts5(
+            nombreproducto, descripcion,
+            content='ventagarage', content_rowid='idventagarage',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """,
+    "ventagarage_fts_ai": """
+        CREATE TRIGGER IF NOT EXISTS ventagarage_fts_ai AFTER INSERT ON ventagarage BEGIN
+            INSERT INTO ventagarage_fts(rowid, nombreproducto, descripcion)
+            VALUES (new.idventagarage, new.nombreproducto, new.descripcion);
+        END
+    """,
+    "ventagarage_fts_ad": """
+        CREATE TRIGGER IF NOT EXISTS ventagarage_fts_ad AFTER DELETE ON ventagarage BEGIN
+            INSERT INTO ventagarage_fts(ventagarage_fts, rowid, nombreproducto, descripcion)
+            VALUES ('delete', old.idventagarage, old.nombreproducto, old.descripcion);
+        END
+    """,
+    "ventagarage_fts_au": """
+        CREATE TRIGGER IF NOT EXISTS ventagarage_fts_au
+        AFTER UPDATE OF nombreproducto, descripcion ON ventagarage BEGIN
+            INSERT INTO ventagarage_fts(ventagarage_fts, rowid, nombreproducto, descripcion)
+            VALUES ('delete', old.idventagarage, old.nombreproducto, old.descripcion);
+            INSERT INTO ventagarage_fts(rowid, nombreproducto, descripcion)
+            VALUES (new.idventagarage, new.nombreproducto, new.descripcion);
+        END
+    """,
+}
+
+
+def asegurar_indice_texto(using="default"):
+    """✅ Recrea lo que falte del índice FTS5; devuelve los nombres recreados."""
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return []
+    # ✅ antes de 0020 (o tras deshacerla) no debe existir
+    if MIGRACION_FTS not in MigrationRecorder(conn).applied_migrations():
+        return []
+
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s)" % ", ".join(["%s"] * len(SQLITE_FTS)),
+            list(SQLITE_FTS),
+        )
+        existentes = {fila[0] for fila in cursor.fetchall()}
+        faltan = [nombre for nombre in SQLITE_FTS if nombre not in existentes]
+        if not faltan:
+            return []
+        for sql in SQLITE_FTS.values():
+            cursor.execute(sql)
+        # ✅ lo escrito mientras no había triggers no está en el índice
+        cursor.execute("INSERT INTO ventagarage_fts(ventagarage_fts) VALUES ('rebuild')")
+    return faltan
+
+
+def revisar_indice_texto(sender, using="default", verbosity=1, **kwargs):
+    """✅ Receptor de post_migrate."""
+    recreados = asegurar_indice_texto(using)
+    if recreados and verbosity:
+        salida = kwargs.get("stdout") or sys.stdout
+        salida.write(f"  Índice de texto del garage recreado ({', '.join(recreados)})\n")
+
+
+def _palabras(texto):
+    # ✅ solo letras/números: el texto del usuario nunca llega crudo al motor
+    return re.findall(r"\w+", texto or "")[:10]
+
+
+def _consulta_pg(palabras):
+    # ✅ todas las palabras, cada una como prefijo ("zapat" encuentra "zapatos")
+    return " & ".join(f"{p}:*" for p in palabras)
+
+
+def _consulta_fts5(palabras):
+    return " ".join(f'"{p}"*' for p in palabras)
+
+
+def buscar_garage(qs, texto):
+    """✅ Filtra el queryset de VentaGarage por texto; sin texto lo devuelve igual."""
+    palabras = _palabras(texto)
+    if not palabras:
+        return qs
+
+    vendor = connections[qs.db].vendor
+    if vendor == "postgresql":
+        ids = RawSQL(
+            "SELECT idventagarage FROM ventagarage WHERE busqueda @@ to_tsquery(%s::regconfig, %s)",
+            [CONFIG_PG, _consulta_pg(palabras)],
+        )
+        return qs.filter(pk__in=ids)
+
+    if vendor == "sqlite":
+        ids = RawSQL(
+            "SELECT rowid FROM ventagarage_fts WHERE ventagarage_fts MATCH %s",
+            [_consulta_fts5(palabras)],
+        )
+        return qs.filter(pk__in=ids)
+
+    # ✅ otros motores: LIKE de toda la vida
+    for p in palabras:
+        qs = qs.filter(Q(nombreproducto__icontains=p) | Q(descripcion__icontains=p))
+    return qs
+
+
+# ======================================================
+# ✅ FILTROS DEL GARAGE (?q=, ?estado=, ?condicion=, ?precio_min=, ?precio_max=)
+# ======================================================
+def _precio(valor):
+    try:
+        precio = Decimal(valor)
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+    return precio if precio.is_finite() and precio >= 0 else None
+
+
+def _filtros_garage(params):
+    """✅ Solo valores conocidos; lo demás se ignora."""
+    filtros = {}
+    estados = dict(VentaGarage.DISPONIBLE_CHOICES)
+    condiciones = dict(VentaGarage.CONDICION_CHOICES)
+
+    if params.get("estado") in estados:
+        filtros["estadoproducto"] = params["estado"]
+    if params.get("condicion") in condiciones:
+        filtros["condicion"] = params["condicion"]
+
+    precio_min = _precio(params.get("precio_min"))
+    precio_max = _precio(params.get("precio_max"))
+    if precio_min is not None:
+        filtros["valordelbien__gte"] = precio_min
+    if precio_max is not None:
+        filtros["valordelbien__lte"] = precio_max
+    return filtros
+
+
+def filtrar_garage(qs, params):
+    """✅ Filtros + texto; lo comparten /garage/ y la API."""
+    return buscar_garage(qs.filter(**_filtros_garage(params)), params.get("q"))
@@ -0,0 +1,175 @@
+from functools import partial
+
+from django.db import models, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from . import media, pdf_cache, snapshots
+from .models import (
+    DatosPersonales, ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales, VentaGarage
+)
+from .versioning import bump_active_profile_version, bump_data_version, bump_site_version
+
+
+# ======================================================
+# ✅ MODELOS QUE APARECEN EN EL PDF
+# ======================================================
+MODELOS_PDF = (
+    DatosPersonales, ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales,
+)
+
+
+def _perfil_id(instance):
+    if isinstance(instance, DatosPersonales):
+        return instance.pk
+    return instance.perfil_id
+
+
+def invalidar_perfil(perfil_id):
+    """✅ Nueva versión de datos + borra los PDFs cacheados del perfil."""
+    if perfil_id is None:
+        return
+    bump_data_version(perfil_id)
+    pdf_cache.invalidar_perfil(perfil_id)
+
+
+def _on_change(sender, instance, **kwargs):
+    perfil_id = _perfil_id(instance)
+    invalidar_perfil(perfil_id)
+    # ✅ y otra vez al commit: un PDF generado durante la transacción
+    # ✅ pudo haberse cacheado con los datos anteriores
+    transaction.on_commit(partial(invalidar_perfil, perfil_id))
+
+
+for _modelo in MODELOS_PDF:
+    post_save.connect(_on_change, sender=_modelo, dispatch_uid=f"cv_invalidar_save_{_modelo.__name__}")
+    post_delete.connect(_on_change, sender=_modelo, dispatch_uid=f"cv_invalidar_delete_{_modelo.__name__}")
+
+
+# ======================================================
+# ✅ SNAPSHOT DEL PERFIL: SE RECONSTRUYE AL COMMIT (UNA VEZ POR PERFIL)
+# ======================================================
+def _borrado_en_cascada(origin):
+    # ✅ si se está borrando el perfil, sus filas caen con él: no reconstruir
+    if isinstance(origin, QuerySet):
+        return origin.model is DatosPersonales
+    return isinstance(origin, DatosPersonales)
+
+
+def _snapshot_on_save(sender, instance, **kwargs):
+    snapshots.programar(_perfil_id(instance))
+
+
+def _snapshot_on_delete(sender, instance, origin=None, **kwargs):
+    if sender is DatosPersonales or _borrado_en_cascada(origin):
+        return
+    snapshots.programar(_perfil_id(instance))
+
+
+for _modelo in MODELOS_PDF:
+    post_save.connect(_snapshot_on_save, sender=_modelo, dispatch_uid=f"cv_snapshot_save_{_modelo.__name__}")
+    post_delete.connect(_snapshot_on_delete, sender=_modelo, dispatch_uid=f"cv_snapshot_delete_{_modelo.__name__}")
+
+
+# ======================================================
+# ✅ PERFIL ACTIVO CACHEADO EN CADA WORKER (active_profile.py)
+# ======================================================
+def _on_change_perfil_activo(sender, instance, **kwargs):
+    bump_active_profile_version()
+    transaction.on_commit(bump_active_profile_version)
+
+
+post_save.connect(_on_change_perfil_activo, sender=DatosPersonales, dispatch_uid="cv_perfil_activo_save")
+post_delete.connect(_on_change_perfil_activo, sender=DatosPersonales, dispatch_uid="cv_perfil_activo_delete")
+
+
+# ======================================================
+# ✅ CACHÉ DE PÁGINAS: CUALQUIER MODELO DEL SITIO
+# ✅ (TrabajoPDF no se muestra en ninguna página)
+# ======================================================
+MODELOS_SITIO = MODELOS_PDF + (VentaGarage,)
+
+
+def _on_change_sitio(sender, instance, **kwargs):
+    bump_site_version()
+    transaction.on_commit(bump_site_version)
+
+
+for _modelo in MODELOS_SITIO:
+    post_save.connect(_on_change_sitio, sender=_modelo, dispatch_uid=f"cv_sitio_save_{_modelo.__name__}")
+    post_delete.connect(_on_change_sitio, sender=_modelo, dispatch_uid=f"cv_sitio_delete_{_modelo.__name__}")
+
+
+# ======================================================
+# ✅ CACHÉ DE MEDIA: SE BORRA LA COPIA CUANDO CAMBIA EL ARCHIVO
+# ======================================================
+MODELOS_CON_ARCHIVOS = MODELOS_SITIO
+
+
+def _campos_archivo(modelo):
+    return [f.name for f in modelo._meta.concrete_fields if isinstance(f, models.FileField)]
+
+
+def _archivos_anteriores(sender, instance, campos):
+    """✅ {campo: FieldFile en la BD}; sin SELECT si la instancia recuerda lo leído."""
+    cargado = getattr(instance, "_cargado", None)
+    if cargado is not None and all(c in cargado and isinstance(cargado[c], (str, type(None))) for c in campos):
+        return {
+            c: sender._meta.get_field(c).attr_class(instance, sender._meta.get_field(c), cargado[c])
+            for c in campos
+        }
+    anterior = sender.objects.filter(pk=instance.pk).only(*campos).first()
+    if anterior is None:
+        return {}
+    return {c: getattr(anterior, c) for c in campos}
+
+
+def _media_pre_save(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None:
+        return
+    campos = _campos_archivo(sender)
+    if update_fields is not None:
+        campos = [c for c in campos if c in update_fields]
+    if not campos:
+        return
+
+    for campo, viejo in _archivos_anteriores(sender, instance, campos).items():
+        nuevo = getattr(instance, campo)
+        if not viejo:
+            continue
+        # ✅ otro nombre, archivo quitado o subida nueva con el mismo nombre
+        if not nuevo or nuevo.name != viejo.name or not getattr(nuevo, "_committed", True):
+            media.invalidar(viejo)
+
+
+def _media_post_delete(sender, instance, **kwargs):
+    for campo in _campos_archivo(sender):
+        media.invalidar(getattr(instance, campo))
+
+
+for _modelo in MODELOS_CON_ARCHIVOS:
+    pre_save.connect(_media_pre_save, sender=_modelo, dispatch_uid=f"cv_media_save_{_modelo.__name__}")
+    post_delete.connect(_media_post_delete, sender=_modelo, dispatch_uid=f"cv_media_delete_{_modelo.__name__}")
+
+
+# ======================================================
+# ✅ CAMBIOS MASIVOS (bulk_create / update() no disparan señales)
+# ======================================================
+def cambio_masivo(modelos, perfil_ids):
+    """✅ Hace a mano lo que las señales de arriba harían fila por fila."""
+    modelos = set(modelos)
+    perfil_ids = sorted(set(perfil_ids) - {None})
+
+    if modelos & set(MODELOS_PDF):
+        for perfil_id in perfil_ids:
+            invalidar_perfil(perfil_id)
+            transaction.on_commit(partial(invalidar_perfil, perfil_id))
+            snapshots.programar(perfil_id)
+    if DatosPersonales in modelos:
+        bump_active_profile_version()
+        transaction.on_commit(bump_active_profile_version)
+    if modelos & set(MODELOS_SITIO):
+        bump_site_version()
+        transaction.on_commit(bump_site_version)
@@ -0,0 +1,225 @@
+from datetime import date  # ✅ IMPORTANTE para ordenar cuando hay None
+
+from django.db import models, transaction
+from django.db.models.fields.files import FieldFile
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .loaders import CAMPOS, RELACIONES, completar
+from .models import DatosPersonales, PerfilSnapshot
+
+
+# ======================================================
+# ✅ SNAPSHOT DEL PERFIL
+# ✅ Documento JSON con todo lo que muestra cv/cv.html:
+# ✅ la página pública se arma con UNA consulta.
+# ======================================================
+SECCIONES_CV = tuple(CAMPOS["cv"])
+
+# ✅ nombre en el template (el atributo choca con la relación inversa)
+NOMBRE_EN_TEMPLATE = {"reconocimientos_cv": "reconocimientos"}
+
+
+def _campos_perfil():
+    return [f.name for f in DatosPersonales._meta.concrete_fields]
+
+
+class ArchivoGuardado(FieldFile):
+    """✅ FieldFile restaurado del JSON: la URL se pide al storage al leer."""
+
+    def __init__(self, field, name, url=None):
+        super().__init__(None, field, name)
+        # ✅ snapshots anteriores guardaban también la URL
+        self._url = url
+
+    @property
+    def url(self):
+        return self._url or super().url
+
+
+def _fila(obj, campos):
+    fila = {"pk": obj.pk}
+    for campo in campos:
+        valor = getattr(obj, campo)
+        if isinstance(valor, FieldFile):
+            # ✅ solo el nombre: escribir el snapshot no depende del storage
+            valor = {"name": valor.name} if valor else None
+        fila[campo] = valor
+
+        choices = obj._meta.get_field(campo).choices
+        if choices:
+            fila[f"get_{campo}_display"] = getattr(obj, f"get_{campo}_display")()
+    return fila
+
+
+# ======================================================
+# ✅ CERTIFICADOS PARA ANEXOS (SIDEBAR)
+# ======================================================
+def certificados_de(perfil):
+    certificados = []
+
+    # ✅ CERTIFICADOS DE CURSOS
+    for c in perfil.cursos:
+        if getattr(c, "rutacertificado", None):
+            fecha = getattr(c, "fechafin", None) or getattr(c, "fechainicio", None)
+            certificados.append({
+                "value": f"CUR-{c.pk}",
+                "nombre": c.nombrecurso,
+                "tipo": "Curso",
+                "fecha": fecha
+            })
+
+    # ✅ CERTIFICADOS DE RECONOCIMIENTOS
+    for r in perfil.reconocimientos_cv:
+        if getattr(r, "rutacertificado", None):
+            fecha = getattr(r, "fechareconocimiento", None)
+            certificados.append({
+                "value": f"REC-{r.pk}",
+                "nombre": f"{r.tiporeconocimiento} - {r.descripcionreconocimiento}",
+                "tipo": "Reconocimiento",
+                "fecha": fecha
+            })
+
+    # ✅ CERTIFICADOS DE PRODUCTOS ACADÉMICOS
+    for pa in perfil.productos_academicos:
+        if getattr(pa, "rutacertificado", None):
+            fecha = getattr(pa, "fecharecurso", None)
+            certificados.append({
+                "value": f"PA-{pa.pk}",
+                "nombre": f"{pa.nombrerecurso} - {pa.clasificador}",
+                "tipo": "Producto académico",
+                "fecha": fecha
+            })
+
+    # ✅ CERTIFICADOS DE PRODUCTOS LABORALES
+    for pl in perfil.productos_laborales:
+        if getattr(pl, "rutacertificado", None):
+            fecha = getattr(pl, "fechaproducto", None)
+            certificados.append({
+                "value": f"PL-{pl.pk}",
+                "nombre": pl.nombreproducto,
+                "tipo": "Producto laboral",
+                "fecha": fecha
+            })
+
+    # ✅ ✅ ✅ ORDEN CORRECTO: MÁS ACTUAL → MÁS ANTIGUO (None al final)
+    certificados.sort(key=lambda x: x["fecha"] or date.min, reverse=True)
+    return certificados
+
+
+def construir_documento(perfil):
+    """✅ Perfil con las secciones de la vista "cv" ya cargadas -> dict serializable."""
+    documento = {"perfil": _fila(perfil, _campos_perfil())}
+    for atributo in SECCIONES_CV:
+        campos = CAMPOS["cv"][atributo]
+        documento[atributo] = [_fila(obj, campos) for obj in getattr(perfil, atributo)]
+    documento["certificados"] = certificados_de(perfil)
+    return documento
+
+
+# ======================================================
+# ✅ RECONSTRUCCIÓN
+# ✅ Las señales la programan al commit, una vez por perfil y transacción
+# ✅ (programar); reconstruir() la hace en el momento.
+# ======================================================
+def reconstruir(perfil_id):
+    """✅ Recalcula el snapshot; si el perfil ya no existe, lo borra."""
+    if perfil_id is None:
+        return None
+    with transaction.atomic():
+        # ✅ bloquea el perfil: dos escrituras simultáneas no se pisan el snapshot
+        perfil = DatosPersonales.objects.select_for_update().filter(pk=perfil_id).first()
+        if perfil is None:
+            PerfilSnapshot.objects.filter(pk=perfil_id).delete()
+            return None
+        completar(perfil, "cv")
+        snapshot, _ = PerfilSnapshot.objects.update_or_create(
+            perfil=perfil, defaults={"documento": construir_documento(perfil)}
+        )
+    return snapshot
+
+
+class _Reconstruir:
+    def __init__(self, perfil_id):
+        self.perfil_id = perfil_id
+        self.hecho = False
+
+    def __call__(self):
+        self.hecho = True
+        reconstruir(self.perfil_id)
+
+
+def _programado(perfil_id):
+    # ✅ run_on_commit ya descarta lo registrado en savepoints deshechos
+    pendientes = transaction.get_connection().run_on_commit
+    return any(
+        isinstance(f, _Reconstruir) and f.perfil_id == perfil_id and not f.hecho
+        for _, f, *_ in pendientes
+    )
+
+
+def programar(perfil_id):
+    """✅ Reconstruye al commit; varias escrituras del mismo perfil -> una reconstrucción."""
+    if perfil_id is None or _programado(perfil_id):
+        return
+    # ✅ robust: si falla, se registra en el log y el snapshot queda como estaba
+    # ✅ (contexto_de lo reconstruye si falta; rebuild_snapshots lo repara)
+    transaction.on_commit(_Reconstruir(perfil_id), robust=True)
+
+
+# ======================================================
+# ✅ LECTURA: JSON -> CONTEXTO DEL TEMPLATE
+# ======================================================
+def _fechas(modelo):
+    return {
+        f.name: (parse_datetime if isinstance(f, models.DateTimeField) else parse_date)
+        for f in modelo._meta.concrete_fields
+        if isinstance(f, models.DateField)
+    }
+
+
+def _archivos(modelo):
+    return {f.name: f for f in modelo._meta.concrete_fields if isinstance(f, models.FileField)}
+
+
+def _restaurar(filas, modelo):
+    # ✅ el JSON guarda las fechas como texto; el template usa |date
+    fechas = _fechas(modelo)
+    # ✅ y los archivos como {name, url}; {% imagen_responsive %} necesita el storage
+    archivos = _archivos(modelo)
+    for fila in filas:
+        for campo, parse in fechas.items():
+            # ✅ recién reconstruido (contexto_de) aún no pasó por JSON
+            if isinstance(fila.get(campo), str):
+                fila[campo] = parse(fila[campo])
+        for campo, field in archivos.items():
+            if isinstance(fila.get(campo), dict):
+                fila[campo] = ArchivoGuardado(field, fila[campo]["name"], fila[campo].get("url"))
+    return filas
+
+
+def contexto(documento):
+    perfil = documento.get("perfil")
+    ctx = {
+        "perfil": _restaurar([perfil], DatosPersonales)[0] if perfil else None,
+        "garage": [],
+        "certificados": [
+            {**c, "fecha": parse_date(c["fecha"]) if isinstance(c.get("fecha"), str) else c.get("fecha")}
+            for c in documento.get("certificados", [])
+        ],
+    }
+    for atributo in SECCIONES_CV:
+        modelo, _ = RELACIONES[atributo]
+        nombre = NOMBRE_EN_TEMPLATE.get(atributo, atributo)
+        ctx[nombre] = _restaurar(documento.get(atributo, []), modelo)
+    return ctx
+
+
+def contexto_de(perfil_id):
+    """✅ Contexto de cv/cv.html: una lectura por clave primaria."""
+    if perfil_id is None:
+        return contexto({})
+    snapshot = PerfilSnapshot.objects.filter(pk=perfil_id).only("documento").first()
+    if snapshot is None:
+        # ✅ perfil creado antes de existir los snapshots: se arma aquí
+        snapshot = reconstruir(perfil_id)
+    return contexto(snapshot.documento if snapshot else {})
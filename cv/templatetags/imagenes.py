@@ -0,0 +1,36 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from ..responsive import fuentes
+
+
+register = template.Library()
+
+
+# ======================================================
+# ✅ {% imagen_responsive archivo alt="..." sizes="..." max_ancho=640 %}
+# ✅ <picture> con AVIF/WebP y <img> JPEG de respaldo; el navegador
+# ✅ elige el ancho según el viewport (srcset + sizes).
+# ======================================================
+@register.simple_tag
+def imagen_responsive(archivo, alt="", sizes="100vw", max_ancho=None, clase="", carga="lazy"):
+    if not archivo:
+        return ""
+
+    lista = fuentes(archivo, max_ancho)
+    if not lista:
+        # ✅ storage sin derivadas: al menos carga diferida
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+            archivo.url, alt, clase, carga,
+        )
+
+    *modernos, respaldo = lista
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="{}" decoding="async"></picture>',
+        format_html_join(
+            "", '<source type="{}" srcset="{}" sizes="{}">',
+            ((f["tipo"], f["srcset"], sizes) for f in modernos),
+        ),
+        respaldo["src"], respaldo["srcset"], sizes, alt, clase, carga,
+    )
@@ -1,3 +1,142 @@
-from django.test import TestCase
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from cv.management.commands.check_query_plans import revisar, sembrar
+from cv.models import CursosRealizados, DatosPersonales, VentaGarage
+from cv.search import asegurar_indice_texto, buscar_garage
+
+
+def crear_perfil(**extra):
+    return DatosPersonales.objects.create(**{
+        "descripcionperfil": "Dev", "apellidos": "A", "nombres": "B", "nacionalidad": "EC",
+        "lugarnacimiento": "X", "numerocedula": "1234567890", "sexo": "H", "estadocivil": "S",
+        "direcciondomiciliaria": "Calle", **extra,
+    })
+
+
+# ======================================================
+# ✅ PLANES DE CONSULTA: las lecturas públicas deben usar índices
+# ✅ (las mismas que verifica manage.py check_query_plans)
+# ======================================================
+class PlanesDeConsultaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.objetivo = sembrar(perfiles=60, filas=20)
+        with connection.cursor() as cursor:
+            # ✅ sin estadísticas el planificador no ve el volumen sembrado
+            cursor.execute("ANALYZE")
+
+    def test_consultas_publicas_usan_indice(self):
+        verificadas = 0
+        for nombre, plan, resultado in revisar(self.objetivo):
+            if resultado is None:
+                continue
+            ok, motivo = resultado
+            with self.subTest(consulta=nombre):
+                self.assertTrue(ok, f"{motivo}\n{plan}")
+            verificadas += 1
+        if connection.vendor in ("sqlite", "postgresql"):
+            self.assertGreater(verificadas, 0)
+
+
+# ======================================================
+# ✅ ÍNDICE DE TEXTO (SQLite): los triggers se recrean si desaparecen
+# ======================================================
+@skipUnless(connection.vendor == "sqlite", "triggers FTS5 solo en SQLite")
+class IndiceTextoTests(TestCase):
+    def test_recrea_triggers_perdidos(self):
+        self.assertEqual(asegurar_indice_texto(), [])
+
+        with connection.cursor() as cursor:
+            # ✅ lo mismo que deja un AlterField que rehace la tabla
+            cursor.execute("DROP TRIGGER ventagarage_fts_ai")
+        perfil = crear_perfil()
+        item = VentaGarage.objects.create(perfil=perfil, nombreproducto="Bicicleta", valordelbien=10, descripcion="d")
+        self.assertFalse(buscar_garage(VentaGarage.objects.all(), "bicicleta").exists())
+
+        self.assertEqual(asegurar_indice_texto(), ["ventagarage_fts_ai"])
+        self.assertEqual(list(buscar_garage(VentaGarage.objects.all(), "bicicleta")), [item])
+
+
+# ======================================================
+# ✅ ValidatedModel: solo se escribe lo que cambió
+# ======================================================
+class GuardadoParcialTests(TestCase):
+    def setUp(self):
+        self.curso = CursosRealizados.objects.create(
+            perfil=crear_perfil(), nombrecurso="Django", fechainicio=date(2020, 1, 1),
+            fechafin=date(2020, 2, 1), totalhoras=10, descripcioncurso="d", entidadpatrocinadora="E",
+        )
+
+    def _updates(self, ctx):
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "cursosrealizados"')]
+
+    def test_cambiar_un_campo_es_un_update_de_esa_columna(self):
+        curso = CursosRealizados.objects.get(pk=self.curso.pk)
+        curso.activarparaqueseveaenfront = not curso.activarparaqueseveaenfront
+        with CaptureQueriesContext(connection) as ctx:
+            curso.save()
+
+        updates = self._updates(ctx)
+        self.assertEqual(len(updates), 1)
+        columnas = updates[0].split(" SET ")[1].split(" WHERE ")[0]
+        self.assertEqual(columnas.count("="), 1)
+        self.assertIn('"activarparaqueseveaenfront"', columnas)
+
+    def test_sin_cambios_no_escribe(self):
+        curso = CursosRealizados.objects.get(pk=self.curso.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            curso.save()
+        self.assertEqual(self._updates(ctx), [])
+
+    def test_update_fields_parcial_no_pierde_los_otros_cambios(self):
+        curso = CursosRealizados.objects.get(pk=self.curso.pk)
+        curso.nombrecurso = "Nuevo"
+        curso.totalhoras = 20
+        curso.save(update_fields=["totalhoras"])
+        self.assertEqual(curso.campos_cambiados(), {"nombrecurso"})
+        curso.save()
+
+        curso.refresh_from_db()
+        self.assertEqual((curso.nombrecurso, curso.totalhoras), ("Nuevo", 20))
+
+
+# ======================================================
+# ✅ PDF EN SEGUNDO PLANO: crear -> worker -> estado -> descarga
+# ======================================================
+class TrabajosPDFTests(TestCase):
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        ajustes = override_settings(CV_PDF_CACHE_DIR=carpeta.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        crear_perfil(perfilactivo=1)
+
+    def test_flujo_completo(self):
+        # ✅ como un cliente externo: sin cookie ni token CSRF
+        cliente = Client(enforce_csrf_checks=True)
+        r = cliente.post("/pdf/trabajos/", {"sec": ["datos"]})
+        self.assertEqual(r.status_code, 202)
+        trabajo = r.json()
+        self.assertEqual(trabajo["estado"], "pendiente")
+
+        r = cliente.get(trabajo["download_url"])
+        self.assertEqual(r.status_code, 409)
+
+        call_command("pdf_worker", procesos=1, una_vez=True, stdout=StringIO())
+
+        r = cliente.get(trabajo["status_url"])
+        self.assertEqual((r.json()["estado"], r.json()["progreso"]), ("listo", 100))
+
+        r = cliente.get(trabajo["download_url"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(r.streaming_content).startswith(b"%PDF"))
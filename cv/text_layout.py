@@ -0,0 +1,91 @@
+from functools import lru_cache
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+# ======================================================
+# ✅ TABLA DE ANCHOS POR (FUENTE, TAMAÑO)
+# ✅ Cada palabra se mide una vez; la memoria queda acotada:
+# ✅ hasta PALABRAS_POR_TABLA palabras (LRU) x 64 tablas.
+# ======================================================
+PALABRAS_POR_TABLA = 4096
+
+
+class TablaAnchos:
+    def __init__(self, font, size):
+        self.font = font
+        self.size = size
+        self.espacio = stringWidth(" ", font, size)
+        # ✅ lru_cache en C: casi tan rápido como un dict y no crece sin límite
+        self.ancho = lru_cache(maxsize=PALABRAS_POR_TABLA)(self._medir)
+
+    def _medir(self, palabra):
+        return stringWidth(palabra, self.font, self.size)
+
+
+@lru_cache(maxsize=64)
+def tabla_anchos(font, size):
+    return TablaAnchos(font, size)
+
+
+# ======================================================
+# ✅ CORTE DE LÍNEAS EN UNA SOLA PASADA
+# ======================================================
+def wrap_text(text, font, size, max_width):
+    """
+    ✅ Parte el texto en líneas que caben en `max_width`.
+    ✅ Suma anchos de palabras (las fuentes base no tienen kerning),
+    ✅ así que es lineal en el largo del texto.
+    """
+    if not text:
+        return []
+
+    tabla = tabla_anchos(font, size)
+    espacio = tabla.espacio
+
+    lineas = []
+    actual = []
+    ancho_actual = 0.0
+
+    for palabra in str(text).split():
+        w = tabla.ancho(palabra)
+        if not actual:
+            actual = [palabra]
+            ancho_actual = w
+        elif ancho_actual + espacio + w <= max_width:
+            actual.append(palabra)
+            ancho_actual += espacio + w
+        else:
+            lineas.append(" ".join(actual))
+            actual = [palabra]
+            ancho_actual = w
+
+    if actual:
+        lineas.append(" ".join(actual))
+    return lineas
+
+
+class Parrafo:
+    """✅ Resultado del layout: el alto y el dibujo salen de las mismas líneas."""
+
+    def __init__(self, lineas, font, size, leading):
+        self.lineas = lineas
+        self.font = font
+        self.size = size
+        self.leading = leading
+
+    @property
+    def alto(self):
+        return len(self.lineas) * self.leading
+
+    def dibujar(self, p, x, y):
+        """✅ Dibuja desde la línea base `y` hacia abajo; devuelve la nueva `y`."""
+        p.setFont(self.font, self.size)
+        for linea in self.lineas:
+            p.drawString(x, y, linea)
+            y -= self.leading
+        return y
+
+
+def layout_text(text, font="Helvetica", size=10, leading=12, max_width=100):
+    return Parrafo(wrap_text(text, font, size, max_width), font, size, leading)
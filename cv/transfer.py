@@ -0,0 +1,209 @@
+import csv
+import datetime
+import json
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router
+from django.utils import timezone
+
+from .models import (
+    DatosPersonales, ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales, VentaGarage
+)
+
+
+# ======================================================
+# ✅ EXPORTACIÓN / IMPORTACIÓN MASIVA (manage.py export_cv / import_cv)
+# ✅ Un archivo por modelo: <carpeta>/<modelo>.jsonl o <modelo>.csv
+# ✅ La clave es la pk: reimportar el mismo archivo actualiza, no duplica.
+# ✅ TrabajoPDF y PerfilSnapshot no se exportan: se regeneran solos.
+# ======================================================
+# ✅ padres primero: al importar, las FKs ya existen
+MODELOS = (
+    DatosPersonales, ExperienciaLaboral, CursosRealizados, Reconocimientos,
+    ProductosAcademicos, ProductosLaborales, VentaGarage,
+)
+FORMATOS = ("jsonl", "csv")
+
+
+def modelo_por_nombre(nombre):
+    return {m._meta.model_name: m for m in MODELOS}.get(nombre.lower())
+
+
+def nombre_archivo(modelo, formato):
+    return f"{modelo._meta.model_name}.{formato}"
+
+
+def columnas(modelo):
+    # ✅ attname: las FKs salen como perfil_id y los archivos como su nombre en el storage
+    return [f.attname for f in modelo._meta.concrete_fields]
+
+
+def perfil_de(modelo, obj):
+    return obj.pk if modelo is DatosPersonales else obj.perfil_id
+
+
+# ======================================================
+# ✅ EXPORTAR (STREAMING)
+# ======================================================
+def _texto(valor):
+    if valor is None:
+        return ""
+    return valor.isoformat() if hasattr(valor, "isoformat") else str(valor)
+
+
+class _Encoder(DjangoJSONEncoder):
+    def default(self, o):
+        # ✅ DjangoJSONEncoder recorta a milisegundos; al reimportar cambiaría la fecha
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def exportar(modelo, archivo, formato, chunk_size=2000):
+    """✅ Escribe todas las filas del modelo en `archivo`; devuelve cuántas."""
+    cols = columnas(modelo)
+    filas = modelo.objects.order_by("pk").values_list(*cols).iterator(chunk_size=chunk_size)
+
+    n = 0
+    if formato == "csv":
+        escritor = csv.writer(archivo)
+        escritor.writerow(cols)
+        for fila in filas:
+            escritor.writerow([_texto(v) for v in fila])
+            n += 1
+    else:
+        for fila in filas:
+            archivo.write(json.dumps(dict(zip(cols, fila)), cls=_Encoder, ensure_ascii=False))
+            archivo.write("\n")
+            n += 1
+    return n
+
+
+# ======================================================
+# ✅ IMPORTAR (LOTES VALIDADOS + bulk_create CON UPSERT)
+# ======================================================
+def _leer(archivo, formato):
+    """✅ (número de línea, dict o None si la línea no es JSON válido), sin cargar el archivo entero."""
+    if formato == "csv":
+        # ✅ la línea 1 es la cabecera
+        for n, fila in enumerate(csv.DictReader(archivo), start=2):
+            yield n, fila
+        return
+    for n, linea in enumerate(archivo, start=1):
+        if not linea.strip():
+            continue
+        try:
+            datos = json.loads(linea)
+        except ValueError:
+            datos = None
+        yield n, datos if isinstance(datos, dict) else None
+
+
+def _instancia(modelo, datos, desde_csv):
+    obj = modelo()
+    for f in modelo._meta.concrete_fields:
+        if f.attname not in datos:
+            continue
+        valor = datos[f.attname]
+        # ✅ en CSV no hay null: la celda vacía lo es si el campo lo admite
+        if desde_csv and valor == "" and f.null:
+            valor = None
+        setattr(obj, f.attname, valor)
+
+    # ✅ auto_now_add se desactiva al importar (ver _fechas_originales)
+    for f in modelo._meta.concrete_fields:
+        if getattr(f, "auto_now_add", False) and f.attname not in datos:
+            setattr(obj, f.attname, timezone.now())
+    return obj
+
+
+def validar_lote(modelo, lote):
+    """✅ lote = [(línea, obj)] -> {línea: {campo: [mensajes]}} (ver ValidatedModel.validar_lote)."""
+    errores = {}
+    con_pk = []
+    for linea, obj in lote:
+        if obj.pk in (None, ""):
+            errores[linea] = {modelo._meta.pk.attname: ["Falta la clave primaria."]}
+        else:
+            con_pk.append((linea, obj))
+
+    for i, mensajes in modelo.validar_lote([obj for _, obj in con_pk]).items():
+        errores[con_pk[i][0]] = mensajes
+    return errores
+
+
+@contextmanager
+def _fechas_originales(modelo):
+    """✅ bulk_create respeta auto_now_add y pisaría las fechas exportadas."""
+    campos = [f for f in modelo._meta.concrete_fields if getattr(f, "auto_now_add", False)]
+    for f in campos:
+        f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f in campos:
+            f.auto_now_add = True
+
+
+def _guardar(modelo, objs, batch_size):
+    conn = connections[router.db_for_write(modelo)]
+    opciones = {
+        "update_conflicts": True,
+        "update_fields": [f.name for f in modelo._meta.concrete_fields if not f.primary_key],
+    }
+    if conn.features.supports_update_conflicts_with_target:
+        opciones["unique_fields"] = [modelo._meta.pk.name]
+    with _fechas_originales(modelo):
+        modelo.objects.bulk_create(objs, batch_size=batch_size, **opciones)
+
+
+def importar(modelo, archivo, formato, chunk_size=1000):
+    """
+    ✅ Lee, valida y guarda por lotes de `chunk_size`.
+    ✅ Devuelve (filas, perfil_ids, errores); si hay errores deja de escribir
+    ✅ (sigue validando para reportarlos todos) y quien llama debe deshacer
+    ✅ la transacción.
+    """
+    filas = 0
+    perfil_ids = set()
+    errores = {}
+    lineas = _leer(archivo, formato)
+
+    while True:
+        bloque = list(islice(lineas, chunk_size))
+        if not bloque:
+            break
+
+        lote = []
+        for linea, datos in bloque:
+            if datos is None:
+                errores[linea] = {"__all__": ["Línea que no es un objeto JSON."]}
+            else:
+                lote.append((linea, _instancia(modelo, datos, formato == "csv")))
+        errores.update(validar_lote(modelo, lote))
+
+        if not errores:
+            objs = [obj for _, obj in lote]
+            _guardar(modelo, objs, chunk_size)
+            perfil_ids.update(perfil_de(modelo, obj) for obj in objs)
+            filas += len(objs)
+
+    return filas, perfil_ids, errores
+
+
+def reiniciar_secuencias(modelos):
+    """✅ Las pks llegaron explícitas: las secuencias (PostgreSQL) deben ir detrás."""
+    por_bd = {}
+    for modelo in modelos:
+        por_bd.setdefault(router.db_for_write(modelo), []).append(modelo)
+    for alias, lista in por_bd.items():
+        conn = connections[alias]
+        sentencias = conn.ops.sequence_reset_sql(no_style(), lista)
+        if sentencias:
+            with conn.cursor() as cursor:
+                for sql in sentencias:
+                    cursor.execute(sql)
@@ -0,0 +1,146 @@
+import uuid
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from . import images
+from .models import SubidaPendiente
+
+
+# ======================================================
+# ✅ FOTOS DIFERIDAS: EL FORMULARIO NO ESPERA A CLOUDINARY
+# ✅ 1) se normaliza la foto (images.normalizar_foto)
+# ✅ 2) el registro se guarda con su foto anterior + una SubidaPendiente
+# ✅ 3) manage.py upload_worker la sube y actualiza el campo
+# ✅ Solo con CV_UPLOADS_DIFERIDOS=1 (y el worker corriendo); si no, se sube en el request
+# ======================================================
+def _diferir():
+    return getattr(settings, "CV_UPLOADS_DIFERIDOS", False)
+
+
+def _max_intentos():
+    return getattr(settings, "CV_UPLOAD_MAX_INTENTOS", 3)
+
+
+def espera(intentos):
+    """✅ Segundos hasta el próximo intento: base, 2x base, 4x base... (máx. 1 hora)."""
+    base = getattr(settings, "CV_UPLOAD_BACKOFF", 30)
+    return min(base * 2 ** max(intentos - 1, 0), 60 * 60)
+
+
+def _etiqueta(obj):
+    return obj._meta.label_lower
+
+
+def guardar_diferido(obj, campos):
+    """✅ obj.save() sin subir las fotos nuevas de `campos`; quedan en la cola."""
+    nuevas = []
+    for campo in campos:
+        archivo = getattr(obj, campo)
+        if not archivo or getattr(archivo, "_committed", True):
+            continue
+        nombre, contenido = images.normalizar_foto(archivo)
+        if _diferir():
+            # ✅ mientras tanto se ve la foto que había (ver ValidatedModel._cargado)
+            setattr(obj, campo, getattr(obj, "_cargado", {}).get(campo))
+            nuevas.append((campo, nombre, contenido))
+        else:
+            setattr(obj, campo, ContentFile(contenido, name=nombre))
+
+    with transaction.atomic():
+        obj.save()
+        for campo, nombre, contenido in nuevas:
+            encolar(obj, campo, nombre, contenido)
+    return obj
+
+
+def encolar(obj, campo, nombre, contenido):
+    # ✅ una por campo: la foto más reciente reemplaza a la que no se subió
+    subida, _ = SubidaPendiente.objects.update_or_create(
+        modelo=_etiqueta(obj), objeto_id=obj.pk, campo=campo,
+        defaults={
+            "nombre": nombre, "contenido": contenido, "token": uuid.uuid4(),
+            "estado": "pendiente", "intentos": 0, "error": "", "proximo_intento": timezone.now(),
+        },
+    )
+    return subida
+
+
+def pendiente(obj, campo):
+    """✅ ¿Hay una foto nueva esperando para este campo?"""
+    if obj is None or obj.pk is None:
+        return False
+    return SubidaPendiente.objects.filter(
+        modelo=_etiqueta(obj), objeto_id=obj.pk, campo=campo
+    ).exclude(estado="error").exists()
+
+
+# ======================================================
+# ✅ WORKER
+# ======================================================
+def reclamar():
+    """✅ Igual que jobs.reclamar(): UPDATE condicionado, sin brokers."""
+    while True:
+        pk = (
+            # ✅ las que fallaron esperan su turno (ver espera())
+            SubidaPendiente.objects.filter(estado="pendiente", proximo_intento__lte=timezone.now())
+            .order_by("creado")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        tomados = SubidaPendiente.objects.filter(pk=pk, estado="pendiente").update(
+            estado="procesando", actualizado=timezone.now()
+        )
+        if tomados == 1:
+            return SubidaPendiente.objects.get(pk=pk)
+
+
+def recuperar_colgadas():
+    """✅ Devuelve a la cola las subidas de un worker que murió a mitad."""
+    limite = timezone.now() - timedelta(seconds=getattr(settings, "CV_UPLOAD_TIMEOUT", 300))
+    return SubidaPendiente.objects.filter(estado="procesando", actualizado__lt=limite).update(
+        estado="pendiente"
+    )
+
+
+def procesar(subida):
+    modelo = apps.get_model(subida.modelo)
+    field = modelo._meta.get_field(subida.campo)
+    obj = modelo.objects.filter(pk=subida.objeto_id).first()
+    if obj is None:
+        # ✅ el registro se borró antes de subir su foto
+        SubidaPendiente.objects.filter(pk=subida.pk, token=subida.token).delete()
+        return False
+
+    try:
+        nombre = field.storage.save(
+            field.generate_filename(obj, subida.nombre), ContentFile(bytes(subida.contenido)),
+            max_length=field.max_length,
+        )
+    except Exception as e:
+        intentos = subida.intentos + 1
+        ahora = timezone.now()
+        SubidaPendiente.objects.filter(pk=subida.pk, token=subida.token).update(
+            estado="error" if intentos >= _max_intentos() else "pendiente",
+            intentos=intentos, error=str(e)[:2000], actualizado=ahora,
+            proximo_intento=ahora + timedelta(seconds=espera(intentos)),
+        )
+        return False
+
+    with transaction.atomic():
+        vigente = SubidaPendiente.objects.select_for_update().filter(pk=subida.pk, token=subida.token).first()
+        if vigente is None:
+            # ✅ llegó otra foto mientras subíamos esta: la siguiente vuelta sube esa
+            transaction.on_commit(lambda: field.storage.delete(nombre))
+            return False
+        setattr(obj, subida.campo, nombre)
+        # ✅ señales normales: snapshot, versiones y caché de media
+        obj.save(update_fields=[subida.campo])
+        vigente.delete()
+    return True
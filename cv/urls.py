@@ -1,11 +1,22 @@
 from django.urls import path
 from .views import cv_view, editar_perfil, cv_pdf
-from . import views
+from . import api, views
 
 urlpatterns = [
     path("", cv_view, name="cv_view"),
     path("editar/", editar_perfil, name="editar_perfil"),
     path("pdf/", cv_pdf, name="cv_pdf"),
     path("garage/", views.garage_list, name="garage_list"),
+    path("img/<str:token>/", views.imagen_derivada, name="imagen_derivada"),
+
+    # ✅ PDF en segundo plano
+    path("pdf/trabajos/", views.pdf_job_create, name="pdf_job_create"),
+    path("pdf/trabajos/<uuid:token>/", views.pdf_job_status, name="pdf_job_status"),
+    path("pdf/trabajos/<uuid:token>/descargar/", views.pdf_job_download, name="pdf_job_download"),
+
+    # ✅ API JSON (solo lectura)
+    path("api/perfil/", api.api_perfil, name="api_perfil"),
+    path("api/perfil/<str:seccion>/", api.api_seccion, name="api_seccion"),
+    path("api/garage/", api.api_garage, name="api_garage"),
 
 ]
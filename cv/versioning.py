@@ -0,0 +1,66 @@
+import time
+from uuid import uuid4
+
+from django.core.cache import cache
+
+
+# ======================================================
+# ✅ VERSIÓN DE DATOS POR PERFIL
+# ✅ Cambia cada vez que se guarda/borra algo del perfil
+# ======================================================
+def _clave(perfil_id):
+    return f"cv:version:{perfil_id}"
+
+
+def data_version(perfil_id):
+    """✅ Devuelve la versión actual de los datos del perfil."""
+    clave = _clave(perfil_id)
+    version = cache.get(clave)
+    if version is None:
+        # ✅ add() no pisa la versión si otro worker la creó primero
+        cache.add(clave, uuid4().hex, timeout=None)
+        version = cache.get(clave)
+    return version
+
+
+def bump_data_version(perfil_id):
+    """✅ Invalida todo lo que dependa de la versión anterior."""
+    cache.set(_clave(perfil_id), uuid4().hex, timeout=None)
+
+
+# ======================================================
+# ✅ VERSIÓN GLOBAL DEL SITIO (CUALQUIER CAMBIO EN cv.models)
+# ✅ Se guarda junto con la fecha del cambio para Last-Modified
+# ======================================================
+_CLAVE_SITIO = "cv:version:sitio"
+
+
+def site_version():
+    """✅ (versión, timestamp) sin consultar la base de datos."""
+    actual = cache.get(_CLAVE_SITIO)
+    if actual is None:
+        cache.add(_CLAVE_SITIO, (uuid4().hex, time.time()), timeout=None)
+        actual = cache.get(_CLAVE_SITIO)
+    return actual
+
+
+def bump_site_version():
+    cache.set(_CLAVE_SITIO, (uuid4().hex, time.time()), timeout=None)
+
+
+# ======================================================
+# ✅ VERSIÓN DEL PERFIL ACTIVO (CUALQUIER ESCRITURA EN DatosPersonales)
+# ======================================================
+_CLAVE_PERFIL_ACTIVO = "cv:version:perfil_activo"
+
+
+def active_profile_version():
+    version = cache.get(_CLAVE_PERFIL_ACTIVO)
+    if version is None:
+        cache.add(_CLAVE_PERFIL_ACTIVO, uuid4().hex, timeout=None)
+        version = cache.get(_CLAVE_PERFIL_ACTIVO)
+    return version
+
+
+def bump_active_profile_version():
+    cache.set(_CLAVE_PERFIL_ACTIVO, uuid4().hex, timeout=None)
@@ -1,29 +1,27 @@
-from django.shortcuts import render, redirect
-from django.http import HttpResponse
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.units import cm
-from reportlab.pdfbase.pdfmetrics import stringWidth
-from reportlab.lib.utils import ImageReader
-
-from urllib.request import urlopen
-from io import BytesIO
-from datetime import date  # ✅ IMPORTANTE para ordenar cuando hay None
-
-from .models import (
-    DatosPersonales, ExperienciaLaboral, CursosRealizados, Reconocimientos,
-    ProductosAcademicos, ProductosLaborales, VentaGarage
-)
+from django.apps import apps
+from django.conf import settings
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from .models import TrabajoPDF, VentaGarage
 
 from .forms import DatosPersonalesForm
+from .loaders import completar, visibles
+from .pagination import pagina_keyset
+from .search import filtrar_garage
+from .page_cache import cache_pagina
+from . import images, jobs, pdf_cache, responsive, snapshots, uploads
+from .renderers import get_renderer, nombre_motor
 
 
 # ======================================================
 # ✅ VISTA PARA EDITAR PERFIL
 # ======================================================
 def editar_perfil(request):
-    perfil = DatosPersonales.objects.filter(perfilactivo=1).first()
+    perfil = request.perfil
 
     if request.method == "POST":
         form = DatosPersonalesForm(request.POST, request.FILES, instance=perfil)
@@ -31,497 +29,143 @@ def editar_perfil(request):
             nuevo = form.save(commit=False)
             if not perfil:
                 nuevo.perfilactivo = 1
-            nuevo.save()
+            # ✅ la foto se sube en segundo plano (manage.py upload_worker)
+            uploads.guardar_diferido(nuevo, ["fotoperfil"])
             return redirect("cv_view")
     else:
         form = DatosPersonalesForm(instance=perfil)
 
-    return render(request, "cv/editar_perfil.html", {"form": form, "perfil": perfil})
+    return render(request, "cv/editar_perfil.html", {
+        "form": form,
+        "perfil": perfil,
+        "foto_pendiente": uploads.pendiente(perfil, "fotoperfil"),
+    })
 
 
 # ======================================================
 # ✅ VISTA NORMAL HTML
 # ✅ Lista de CERTIFICADOS (Cursos + Reconocimientos + Productos)
 # ======================================================
+@cache_pagina("cv")
 def cv_view(request):
-    perfil = DatosPersonales.objects.filter(perfilactivo=1).first()
-
-    experiencia = []
-    cursos = []
-    reconocimientos = []
-    productos_academicos = []
-    productos_laborales = []
-    garage = []
-
-    certificados = []  # ✅ lista unificada para anexos
-
-    if perfil:
-        experiencia = ExperienciaLaboral.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-
-        cursos = CursosRealizados.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-
-        reconocimientos = Reconocimientos.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-
-        productos_academicos = ProductosAcademicos.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-
-        productos_laborales = ProductosLaborales.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-
-        productos = VentaGarage.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
-        )
-
-        # ======================================================
-        # ✅ CERTIFICADOS PARA ANEXOS (SIDEBAR)
-        # ======================================================
-
-        # ✅ CERTIFICADOS DE CURSOS
-        for c in cursos:
-            if getattr(c, "rutacertificado", None):
-                fecha = getattr(c, "fechafin", None) or getattr(c, "fechainicio", None)
-                certificados.append({
-                    "value": f"CUR-{c.pk}",
-                    "nombre": c.nombrecurso,
-                    "tipo": "Curso",
-                    "fecha": fecha
-                })
-
-        # ✅ CERTIFICADOS DE RECONOCIMIENTOS
-        for r in reconocimientos:
-            if getattr(r, "rutacertificado", None):
-                fecha = getattr(r, "fechareconocimiento", None)
-                certificados.append({
-                    "value": f"REC-{r.pk}",
-                    "nombre": f"{r.tiporeconocimiento} - {r.descripcionreconocimiento}",
-                    "tipo": "Reconocimiento",
-                    "fecha": fecha
-                })
-
-        # ✅ CERTIFICADOS DE PRODUCTOS ACADÉMICOS
-        for pa in productos_academicos:
-            if getattr(pa, "rutacertificado", None):
-                fecha = getattr(pa, "fecharecurso", None)
-                certificados.append({
-                    "value": f"PA-{pa.pk}",
-                    "nombre": f"{pa.nombrerecurso} - {pa.clasificador}",
-                    "tipo": "Producto académico",
-                    "fecha": fecha
-                })
-
-        # ✅ CERTIFICADOS DE PRODUCTOS LABORALES
-        for pl in productos_laborales:
-            if getattr(pl, "rutacertificado", None):
-                fecha = getattr(pl, "fechaproducto", None)
-                certificados.append({
-                    "value": f"PL-{pl.pk}",
-                    "nombre": pl.nombreproducto,
-                    "tipo": "Producto laboral",
-                    "fecha": fecha
-                })
-
-        # ✅ ✅ ✅ ORDEN CORRECTO: MÁS ACTUAL → MÁS ANTIGUO (None al final)
-        certificados.sort(key=lambda x: x["fecha"] or date.min, reverse=True)
-
-    return render(request, "cv/cv.html", {
-        "perfil": perfil,
-        "experiencia": experiencia,
-        "cursos": cursos,
-        "reconocimientos": reconocimientos,
-        "productos_academicos": productos_academicos,
-        "productos_laborales": productos_laborales,
-        "garage": garage,
-        "certificados": certificados,  # ✅ sidebar
-    })
+    # ✅ todo sale del snapshot del perfil: 1 consulta (0 si la página está en caché)
+    perfil_id = request.perfil.pk if request.perfil else None
+    return render(request, "cv/cv.html", snapshots.contexto_de(perfil_id))
 
 
 # ======================================================
 # ✅ PDF (REPORTLAB) + ANEXOS CERTIFICADOS
+# ✅ Se cachea en disco por versión de datos + selección
 # ======================================================
 def cv_pdf(request):
-    secciones = request.GET.getlist("sec")
-    certificados_tokens = request.GET.getlist("cert")
+    secciones = pdf_cache.normalizar_secciones(request.GET.getlist("sec"))
+    certificados_tokens = pdf_cache.normalizar_tokens(request.GET.getlist("cert"))
+    motor = nombre_motor(request.GET.get("engine"))
+    renderer = get_renderer(motor)
 
-    perfil = DatosPersonales.objects.filter(perfilactivo=1).first()
+    perfil = request.perfil
 
-    experiencia = []
-    cursos = []
-    productos_academicos = []
-    productos_laborales = []
-    reconocimientos_cv = Reconocimientos.objects.none()
+    if not perfil:
+        response = HttpResponse(content_type="application/pdf")
+        response["Content-Disposition"] = 'inline; filename="hoja_vida.pdf"'
+        renderer.render(response, None, secciones, certificados_tokens)
+        return response
 
-    if perfil:
-        experiencia = ExperienciaLaboral.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-        cursos = CursosRealizados.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-        reconocimientos_cv = Reconocimientos.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-        productos_academicos = ProductosAcademicos.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
-        productos_laborales = ProductosLaborales.objects.filter(
-            perfil=perfil, activarparaqueseveaenfront=True
-        )
+    # ✅ GET condicional antes de tocar la caché o el motor
+    clave = pdf_cache.cache_key(perfil, secciones, certificados_tokens, motor)
+    no_modificado = pdf_cache.no_modificado(request, clave)
+    if no_modificado is not None:
+        return no_modificado
 
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = 'inline; filename="hoja_vida.pdf"'
-
-    p = canvas.Canvas(response, pagesize=letter)
-    width, height = letter
-
-    x_left = 2 * cm
-    x_right = width - 2 * cm
-    y = height - 2 * cm
-
-    # ======================================================
-    # ✅ FUNCIONES PDF
-    # ======================================================
-    def draw_image_from_url(img_url, x, y_pos, w, h):
-        try:
-            with urlopen(img_url, timeout=7) as response_img:
-                image_bytes = response_img.read()
-            image_file = BytesIO(image_bytes)
-            img = ImageReader(image_file)
-            p.drawImage(img, x, y_pos, width=w, height=h, mask="auto")
-            return True
-        except:
-            return False
-
-    def nueva_pagina_si_es_necesario(min_y=3 * cm):
-        nonlocal y
-        if y < min_y:
-            p.showPage()
-            y = height - 2 * cm
-
-    def draw_section_title(text):
-        nonlocal y
-        nueva_pagina_si_es_necesario()
-        y -= 0.15 * cm
-        p.setFillColor(colors.HexColor("#1f2937"))
-        p.setFont("Helvetica-Bold", 12)
-        p.drawString(x_left, y, text.upper())
-        y -= 0.55 * cm
-        if text.lower() != "datos personales":
-            p.setStrokeColor(colors.HexColor("#1f2937"))
-            p.setLineWidth(1)
-            p.line(x_left, y, x_right, y)
-        y -= 0.45 * cm
-
-    def draw_wrapped_text(text, font="Helvetica", size=10, leading=16, max_width=None):
-        nonlocal y
-        if not text:
-            return
-        if max_width is None:
-            max_width = x_right - x_left
-
-        p.setFont(font, size)
-        p.setFillColor(colors.black)
-
-        words = str(text).split()
-        line = ""
-
-        for w in words:
-            test = (line + " " + w).strip()
-            if stringWidth(test, font, size) <= max_width:
-                line = test
-            else:
-                nueva_pagina_si_es_necesario()
-                p.drawString(x_left, y, line)
-                y -= leading
-                line = w
-
-        if line:
-            nueva_pagina_si_es_necesario()
-            p.drawString(x_left, y, line)
-            y -= leading
-
-        y -= 4
-
-    def draw_card(title, subtitle=None, body=None):
-        nonlocal y
-        nueva_pagina_si_es_necesario()
-
-        padding = 12
-        leading = 12
-        text_width = (x_right - x_left - 2 * padding)
-
-        def contar_lineas(texto, font="Helvetica", size=9, max_width=text_width):
-            if not texto:
-                return 0
-            palabras = str(texto).split()
-            linea = ""
-            lineas = 1
-            for w in palabras:
-                prueba = (linea + " " + w).strip()
-                if stringWidth(prueba, font, size) <= max_width:
-                    linea = prueba
-                else:
-                    lineas += 1
-                    linea = w
-            return lineas
-
-        card_height = 10 + 16
-        if subtitle:
-            card_height += 13
-        if body:
-            lineas_body = contar_lineas(body, font="Helvetica", size=9)
-            card_height += (lineas_body * leading)
-        card_height += 14
-
-        p.setFillColor(colors.HexColor("#F3F4F6"))
-        p.setStrokeColor(colors.HexColor("#D1D5DB"))
-        p.roundRect(
-            x_left, y - card_height,
-            x_right - x_left, card_height,
-            10, fill=1, stroke=1
-        )
+    # ✅ solo las secciones pedidas, con las columnas del PDF
+    completar(perfil, "pdf", secciones)
+    archivo = pdf_cache.obtener_o_generar(
+        clave, lambda f: renderer.render(f, perfil, secciones, certificados_tokens)
+    )
+    return pdf_cache.servir_pdf(request, archivo, clave)
 
-        text_y = y - 20
 
-        p.setFillColor(colors.HexColor("#111827"))
-        p.setFont("Helvetica-Bold", 11)
-        p.drawString(x_left + padding, text_y, str(title))
-        text_y -= 14
+# ======================================================
+# ✅ PDF EN SEGUNDO PLANO (COLA + WORKER)
+# ======================================================
+def _trabajo_json(request, trabajo):
+    return {
+        "id": str(trabajo.token),
+        "estado": trabajo.estado,
+        "progreso": trabajo.progreso,
+        "error": trabajo.error or None,
+        "status_url": request.build_absolute_uri(
+            reverse("pdf_job_status", args=[trabajo.token])
+        ),
+        "download_url": request.build_absolute_uri(
+            reverse("pdf_job_download", args=[trabajo.token])
+        ),
+    }
+
+
+# ✅ sin CSRF: solo encola un PDF de datos públicos y la página principal
+# ✅ está cacheada (no puede llevar un token por usuario)
+@csrf_exempt
+@require_POST
+def pdf_job_create(request):
+    perfil = request.perfil
+    if not perfil:
+        return JsonResponse({"error": "No existe un perfil activo."}, status=404)
 
-        if subtitle:
-            p.setFillColor(colors.HexColor("#374151"))
-            p.setFont("Helvetica", 9)
-            p.drawString(x_left + padding, text_y, str(subtitle))
-            text_y -= 12
+    trabajo = jobs.encolar(
+        perfil, request.POST.getlist("sec"), request.POST.getlist("cert"),
+        motor=request.POST.get("engine"),
+    )
+    return JsonResponse(_trabajo_json(request, trabajo), status=202)
 
-        if body:
-            p.setFillColor(colors.black)
-            p.setFont("Helvetica", 9)
 
-            palabras = str(body).split()
-            linea = ""
+@require_GET
+def pdf_job_status(request, token):
+    trabajo = get_object_or_404(TrabajoPDF, token=token)
+    return JsonResponse(_trabajo_json(request, trabajo))
 
-            for w in palabras:
-                prueba = (linea + " " + w).strip()
-                if stringWidth(prueba, "Helvetica", 9) <= text_width:
-                    linea = prueba
-                else:
-                    p.drawString(x_left + padding, text_y, linea)
-                    text_y -= leading
-                    linea = w
 
-            if linea:
-                p.drawString(x_left + padding, text_y, linea)
+@require_GET
+def pdf_job_download(request, token):
+    trabajo = get_object_or_404(TrabajoPDF, token=token)
+    if trabajo.estado != "listo":
+        return JsonResponse(_trabajo_json(request, trabajo), status=409)
 
-        y -= (card_height + 14)
+    no_modificado = pdf_cache.no_modificado(request, trabajo.clave)
+    if no_modificado is not None:
+        return no_modificado
 
-    # ======================================================
-    # ✅ ENCABEZADO
-    # ======================================================
-    if not perfil:
-        p.setFont("Helvetica-Bold", 14)
-        p.drawString(x_left, y, "No existe un perfil activo.")
-        p.save()
-        return response
+    archivo = pdf_cache.abrir(trabajo.clave)
+    if archivo is None:
+        # ✅ el PDF salió de la caché (LRU o datos editados): se vuelve a generar
+        TrabajoPDF.objects.filter(pk=trabajo.pk).update(estado="pendiente", progreso=0, clave="")
+        trabajo.refresh_from_db()
+        return JsonResponse(_trabajo_json(request, trabajo), status=202)
 
-    foto_size = 3.6 * cm
-    foto_x = x_right - foto_size - 0.6 * cm
-    foto_y = height - 5.0 * cm
-
-    if getattr(perfil, "fotoperfil", None):
-        try:
-            draw_image_from_url(perfil.fotoperfil.url, foto_x, foto_y, foto_size, foto_size)
-        except:
-            pass
-
-    p.setFillColor(colors.HexColor("#111827"))
-    p.setFont("Helvetica-Bold", 18)
-    p.drawString(x_left, y, f"{perfil.nombres} {perfil.apellidos}")
-    y -= 22
-
-    p.setFillColor(colors.HexColor("#4b5563"))
-    p.setFont("Helvetica", 11)
-    p.drawString(x_left, y, perfil.descripcionperfil)
-    y -= 25
-
-    # ======================================================
-    # ✅ ORDEN FIJO DEL PDF (como tu hoja de vida)
-    # ======================================================
-    if "datos" in secciones:
-        draw_section_title("Datos personales")
-        draw_wrapped_text(f"Cédula: {perfil.numerocedula}", size=10)
-        draw_wrapped_text(f"Nacionalidad: {perfil.nacionalidad}", size=10)
-        draw_wrapped_text(f"Dirección: {perfil.direcciondomiciliaria}", size=10)
-
-    if "experiencia" in secciones:
-        draw_section_title("Experiencia laboral")
-        if experiencia:
-            for e in experiencia:
-                draw_card(
-                    title=f"{e.cargodesempenado} - {e.nombrempresa}",
-                    subtitle=e.lugarempresa,
-                    body=e.descripcionfunciones
-                )
-        else:
-            draw_card("No hay experiencia registrada.")
-
-    if "cursos" in secciones:
-        draw_section_title("Cursos realizados")
-        if cursos:
-            for c in cursos:
-                draw_card(
-                    title=f"{c.nombrecurso} ({c.totalhoras} horas)",
-                    subtitle=f"{c.fechainicio} - {c.fechafin}",
-                    body=c.descripcioncurso
-                )
-        else:
-            draw_card("No hay cursos registrados.")
-
-    if "reconocimientos" in secciones:
-        draw_section_title("Reconocimientos")
-        if reconocimientos_cv:
-            for r in reconocimientos_cv:
-                draw_card(
-                    title=f"{r.tiporeconocimiento}: {r.descripcionreconocimiento}",
-                    subtitle=r.entidadpatrocinadora,
-                    body=""
-                )
-        else:
-            draw_card("No hay reconocimientos registrados.")
-
-    if "prod_academicos" in secciones:
-        draw_section_title("Productos académicos")
-        if productos_academicos:
-            for pa in productos_academicos:
-                draw_card(
-                    title=pa.nombrerecurso,
-                    subtitle=pa.clasificador,
-                    body=pa.descripcion
-                )
-        else:
-            draw_card("No hay productos académicos registrados.")
-
-    if "prod_laborales" in secciones:
-        draw_section_title("Productos laborales")
-        if productos_laborales:
-            for pl in productos_laborales:
-                draw_card(
-                    title=pl.nombreproducto,
-                    subtitle=str(pl.fechaproducto),
-                    body=pl.descripcion
-                )
-        else:
-            draw_card("No hay productos laborales registrados.")
-
-    # ======================================================
-    # ✅ ANEXOS: CADA CERTIFICADO SELECCIONADO EN HOJA NUEVA
-    # ======================================================
-    if certificados_tokens:
-        contador = 1
-
-        for token in certificados_tokens:
-            token = str(token).strip()
-            if "-" not in token:
-                continue
-
-            tipo, idx = token.split("-", 1)
-            try:
-                idx = int(idx)
-            except:
-                continue
-
-            nombre = ""
-            url_cert = None
-
-            # ✅ CURSOS
-            if tipo == "CUR":
-                obj = CursosRealizados.objects.filter(pk=idx, perfil=perfil).first()
-                if obj and getattr(obj, "rutacertificado", None):
-                    nombre = obj.nombrecurso
-                    url_cert = obj.rutacertificado.url
-
-            # ✅ RECONOCIMIENTOS
-            elif tipo == "REC":
-                obj = Reconocimientos.objects.filter(pk=idx, perfil=perfil).first()
-                if obj and getattr(obj, "rutacertificado", None):
-                    nombre = f"{obj.tiporeconocimiento} - {obj.descripcionreconocimiento}"
-                    url_cert = obj.rutacertificado.url
-
-            # ✅ PRODUCTOS ACADÉMICOS
-            elif tipo == "PA":
-                obj = ProductosAcademicos.objects.filter(pk=idx, perfil=perfil).first()
-                if obj and getattr(obj, "rutacertificado", None):
-                    nombre = f"{obj.nombrerecurso} - {obj.clasificador}"
-                    url_cert = obj.rutacertificado.url
-
-            # ✅ PRODUCTOS LABORALES
-            elif tipo == "PL":
-                obj = ProductosLaborales.objects.filter(pk=idx, perfil=perfil).first()
-                if obj and getattr(obj, "rutacertificado", None):
-                    nombre = obj.nombreproducto
-                    url_cert = obj.rutacertificado.url
-
-            if not url_cert:
-                continue
-
-            p.showPage()
-
-            p.setFillColor(colors.HexColor("#111827"))
-            p.setFont("Helvetica-Bold", 14)
-            p.drawString(x_left, height - 2 * cm, f"ANEXO {contador}: CERTIFICADO")
-
-            p.setFillColor(colors.HexColor("#4b5563"))
-            p.setFont("Helvetica", 10)
-            p.drawString(x_left, height - 2.7 * cm, nombre)
-
-            y_temp = height - 4.0 * cm
-
-            try:
-                # ✅ Solo imágenes
-                if url_cert.lower().endswith((".png", ".jpg", ".jpeg", ".webp")):
-                    with urlopen(url_cert, timeout=7) as response_img:
-                        image_bytes = response_img.read()
-
-                    image_file = BytesIO(image_bytes)
-                    img = ImageReader(image_file)
-
-                    img_w, img_h = img.getSize()
-                    max_w = width - (4 * cm)
-                    max_h = height - (6 * cm)
-
-                    scale = min(max_w / img_w, max_h / img_h)
-                    new_w = img_w * scale
-                    new_h = img_h * scale
-
-                    x_img = (width - new_w) / 2
-                    y_img = (height - new_h) / 2 - 0.8 * cm
-
-                    p.drawImage(img, x_img, y_img, width=new_w, height=new_h, mask="auto")
-
-                else:
-                    p.setFillColor(colors.red)
-                    p.setFont("Helvetica-Bold", 11)
-                    p.drawString(x_left, y_temp, "⚠️ El certificado está en PDF y ReportLab NO lo imprime.")
-                    p.setFillColor(colors.black)
-                    p.setFont("Helvetica", 10)
-                    p.drawString(x_left, y_temp - 18, "Convierte el PDF a PNG/JPG para que se imprima.")
-
-            except:
-                p.setFillColor(colors.red)
-                p.setFont("Helvetica-Bold", 11)
-                p.drawString(x_left, y_temp, "❌ Error al cargar el certificado.")
-
-            contador += 1
-
-    p.save()
+    return pdf_cache.servir_pdf(request, archivo, trabajo.clave)
+
+
+# ======================================================
+# ✅ MINIATURAS DE IMÁGENES EN STORAGE LOCAL (ver cv/responsive.py)
+# ======================================================
+@require_GET
+def imagen_derivada(request, token):
+    datos = responsive.leer_token(token)
+    if datos is None:
+        raise Http404
+    campo, nombre, ancho, formato = datos
+    if ancho not in responsive.anchos() or formato not in responsive.formatos():
+        raise Http404
+
+    app_label, modelo, nombre_campo = campo.split(".")
+    field = apps.get_model(app_label, modelo)._meta.get_field(nombre_campo)
+    ruta = images.ruta_derivada(field.attr_class(None, field, nombre), ancho, formato)
+    if ruta is None:
+        raise Http404
+
+    response = FileResponse(open(ruta, "rb"), content_type=responsive.MIME[formato])
+    # ✅ el token ya identifica archivo + ancho + formato: la URL nunca cambia de contenido
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
     return response
 
 
@@ -529,15 +173,27 @@ def cv_pdf(request):
 # ✅ PÁGINA APARTE: GARAGE BONITO
 # ======================================================
 def garage_list(request):
-    perfil = DatosPersonales.objects.filter(perfilactivo=1).first()
+    # ✅ 1 consulta por página, sin OFFSET (ver cv/pagination.py)
+    perfil = request.perfil
 
-    productos = VentaGarage.objects.none()
+    productos = []
+    siguiente_url = None
+    primera_url = None
     if perfil:
-        productos = VentaGarage.objects.filter(
-            perfil=perfil,
-            activarparaqueseveaenfront=True
+        qs = filtrar_garage(visibles("garage", "garage").filter(perfil=perfil), request.GET)
+        productos, siguiente = pagina_keyset(
+            qs, "fecha_publicacion", request.GET.get("cursor"),
+            getattr(settings, "CV_GARAGE_PAGE_SIZE", 24),
         )
 
+        # ✅ los enlaces conservan los filtros; solo cambia el cursor
+        params = request.GET.copy()
+        if siguiente:
+            params["cursor"] = siguiente
+            siguiente_url = f"?{params.urlencode()}"
+        if request.GET.get("cursor"):
+            params.pop("cursor", None)
+            primera_url = f"?{params.urlencode()}"
 
     whatsapp_number = "59397871697"
 
@@ -545,4 +201,9 @@ def garage_list(request):
         "perfil": perfil,
         "productos": productos,
         "whatsapp_number": whatsapp_number,
+        "filtros": request.GET,
+        "estados": VentaGarage.DISPONIBLE_CHOICES,
+        "condiciones": VentaGarage.CONDICION_CHOICES,
+        "primera_url": primera_url,
+        "siguiente_url": siguiente_url,
     })